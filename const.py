@@ -1,23 +0,0 @@
-"""Constants for Tian API integration."""
-
-DOMAIN = "tian_api"
-NAME = "天聚数行API"
-VERSION = "1.1.2"
-
-CONF_API_KEY = "api_key"
-
-# API endpoints
-MORNING_API_URL = "https://apis.tianapi.com/zaoan/index"
-EVENING_API_URL = "https://apis.tianapi.com/wanan/index"
-POETRY_API_URL = "https://apis.tianapi.com/poetry/index"
-SONG_CI_API_URL = "https://apis.tianapi.com/zmsc/index"
-YUAN_QU_API_URL = "https://apis.tianapi.com/yuanqu/index"
-HISTORY_API_URL = "https://apis.tianapi.com/pitlishi/index"
-SENTENCE_API_URL = "https://apis.tianapi.com/gjmj/index"
-COUPLET_API_URL = "https://apis.tianapi.com/duilian/index"
-MAXIM_API_URL = "https://apis.tianapi.com/enmaxim/index"
-
-# Device info
-DEVICE_NAME = "天聚信息查询"
-DEVICE_MANUFACTURER = "天聚数行"
-DEVICE_MODEL = "信息查询"
\ No newline at end of file
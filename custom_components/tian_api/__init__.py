@@ -4,14 +4,41 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import async_get as async_get_device_registry
 
-from .const import DOMAIN, NAME, VERSION, DEVICE_NAME, DEVICE_MANUFACTURER, DEVICE_MODEL
+from .const import (
+    DOMAIN,
+    NAME,
+    VERSION,
+    DEVICE_NAME,
+    DEVICE_MANUFACTURER,
+    DEVICE_MODEL,
+)
+from .batch import TianContentQueue
+from .budget import TianRequestBudget
+from .corpus import TianContentCorpus
+from .cache import TianResponseCache
+from .coordinator import TianDataUpdateCoordinator
+from .policy import TianRefreshScheduler
+from .prefetch import TianPrefetchScheduler
+from .recent import TianRecentContent
+from .services import async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Tian API from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = entry.data
+
+    # 每个配置条目一个协调器，统一获取所有端点数据
+    coordinator = TianDataUpdateCoordinator(hass, entry)
+    # 先加载持久化缓存，缓存仍有效时重启无需调用API
+    await coordinator.async_load_cache()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # 设置失败时不会调用卸载，需自行关闭会话和语料库
+        await coordinator.async_unload()
+        raise
+    hass.data[DOMAIN][entry.entry_id] = coordinator
     
     # Register the device
     device_registry = async_get_device_registry(hass)
@@ -26,11 +53,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     # Forward the setup to the sensor platform
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
+
+    # 在各滚动时段开始前预取对应端点
+    prefetch = TianPrefetchScheduler(
+        hass,
+        coordinator,
+        coordinator.prefetch_lead,
+    )
+    prefetch.async_start()
+    entry.async_on_unload(prefetch.async_stop)
+
+    # 按各端点的刷新方式定时刷新
+    refresher = TianRefreshScheduler(hass, coordinator)
+    refresher.async_start()
+    entry.async_on_unload(refresher.async_stop)
+
+    async_setup_services(hass)
+
+    # 选项变更后重新加载
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload config entry when options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
-    return unload_ok
\ No newline at end of file
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_unload()
+        async_unload_services(hass)
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove a config entry."""
+    await TianResponseCache(hass, entry.entry_id).async_remove()
+    await TianRequestBudget(hass, entry.entry_id, 0).async_remove()
+    await TianContentQueue(hass, entry.entry_id).async_remove()
+    await TianRecentContent(hass, entry.entry_id, 0).async_remove()
+    await TianContentCorpus(hass, entry.entry_id).async_remove()
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""API client for Tian API integration."""
+import asyncio
+import json
+import logging
+
+import aiohttp
+import async_timeout
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.util.ssl import client_context
+
+from .const import (
+    VERSION,
+    HTTP_LIMIT_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    API_MAX_BODY_BYTES,
+    API_DEBUG_LOG_CHARS,
+)
+
+try:
+    # 安装了orjson时使用更快的解析器
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+_LOGGER = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = 15
+READ_CHUNK_SIZE = 16 * 1024
+
+
+class _TruncatedText:
+    """调试日志使用，只在实际输出时才解码并截断响应内容."""
+
+    def __init__(self, body: bytes):
+        self._body = body
+
+    def __str__(self):
+        text = self._body[:API_DEBUG_LOG_CHARS * 4].decode("utf-8", "ignore")
+        if len(text) > API_DEBUG_LOG_CHARS or len(self._body) > API_DEBUG_LOG_CHARS * 4:
+            return f"{text[:API_DEBUG_LOG_CHARS]}...（共 {len(self._body)} 字节）"
+        return text
+
+
+class TianApiError(Exception):
+    """天聚数行API错误."""
+
+
+class TianApiConnectionError(TianApiError):
+    """请求超时或HTTP错误."""
+
+
+class TianApiAuthError(TianApiError):
+    """API密钥错误（错误码100）."""
+
+
+class TianApiRateLimitError(TianApiError):
+    """API调用频率超限（错误码130）."""
+
+
+class TianApiQuotaExceededError(TianApiError):
+    """API可用次数不足（错误码150）."""
+
+
+def create_session() -> aiohttp.ClientSession:
+    """创建集成专用的会话，复用到接口服务器的长连接."""
+    connector = aiohttp.TCPConnector(
+        ssl=client_context(),
+        limit_per_host=HTTP_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=REQUEST_TIMEOUT,
+            connect=HTTP_CONNECT_TIMEOUT,
+            sock_read=HTTP_READ_TIMEOUT,
+        ),
+        headers={"User-Agent": f"HomeAssistant/{HA_VERSION} tian_api/{VERSION}"},
+    )
+
+
+class TianApiClient:
+    """天聚数行API客户端."""
+
+    def __init__(self, session: aiohttp.ClientSession, api_key: str):
+        """Initialize the client."""
+        self._session = session
+        self._api_key = api_key
+
+    async def async_close(self):
+        """关闭会话."""
+        await self._session.close()
+
+    async def async_fetch(self, url: str, params: dict | None = None, fields: tuple | None = None):
+        """获取API数据，失败时抛出TianApiError.
+
+        指定fields时result中的每条内容只保留这些字段。
+        """
+        query = {"key": self._api_key}
+        if params:
+            query.update(params)
+
+        try:
+            async with async_timeout.timeout(REQUEST_TIMEOUT):
+                async with self._session.get(url, params=query) as response:
+                    if response.status != 200:
+                        _LOGGER.error("HTTP请求失败: %s", response.status)
+                        raise TianApiConnectionError(f"HTTP {response.status}")
+                    body = await self._async_read_body(response)
+            data = json_loads(body)
+        except asyncio.TimeoutError as e:
+            _LOGGER.error("API请求超时")
+            raise TianApiConnectionError("请求超时") from e
+        except aiohttp.ClientError as e:
+            _LOGGER.error("获取API数据时出错: %s", e)
+            raise TianApiConnectionError(str(e)) from e
+        except ValueError as e:
+            _LOGGER.error("API响应解析失败: %s", e)
+            raise TianApiError(str(e)) from e
+
+        _LOGGER.debug("API响应: %s", _TruncatedText(body))
+        if not isinstance(data, dict):
+            raise TianApiError("API响应格式错误")
+
+        # 检查API返回的错误码
+        code = data.get("code")
+        msg = data.get("msg", "未知错误")
+        if code == 200:
+            # 检查result字段是否为空
+            result = data.get("result")
+            if not result or (isinstance(result, list) and len(result) == 0):
+                _LOGGER.warning("API返回空结果: %s", url)
+            elif fields:
+                data["result"] = _project(result, fields)
+            return data
+        elif code == 130:  # 频率限制
+            _LOGGER.warning("API调用频率超限，请稍后再试")
+            raise TianApiRateLimitError(msg)
+        elif code == 150:  # 可用次数不足
+            _LOGGER.warning("API可用次数不足: %s", msg)
+            raise TianApiQuotaExceededError(msg)
+        elif code == 100:  # 常见错误码
+            _LOGGER.error("API密钥错误: %s", msg)
+            raise TianApiAuthError(msg)
+
+        _LOGGER.error("API返回错误[%s]: %s", code, msg)
+        raise TianApiError(f"[{code}] {msg}")
+
+    @staticmethod
+    async def _async_read_body(response):
+        """分块读取响应，超过大小上限时抛出TianApiError."""
+        length = response.headers.get(aiohttp.hdrs.CONTENT_LENGTH)
+        if length is not None and length.isdigit() and int(length) > API_MAX_BODY_BYTES:
+            raise TianApiError(f"响应过大: {length} 字节")
+
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+            body.extend(chunk)
+            if len(body) > API_MAX_BODY_BYTES:
+                raise TianApiError(f"响应超过 {API_MAX_BODY_BYTES} 字节")
+        return bytes(body)
+
+
+def _project(result, fields):
+    """只保留需要的字段，批量响应的每条内容分别处理."""
+    if isinstance(result, list):
+        return [_project(item, fields) for item in result]
+    if isinstance(result, dict):
+        if isinstance(result.get("list"), list):
+            return {**result, "list": _project(result["list"], fields)}
+        return {field: result[field] for field in fields if field in result}
+    return result
@@ -0,0 +1,78 @@
+"""Batched content queue for Tian API integration."""
+import logging
+from collections import deque
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, QUEUE_STORAGE_VERSION, QUEUE_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TianContentQueue:
+    """按端点保存批量获取内容的先进先出队列."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize the queue."""
+        self._store = Store(hass, QUEUE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.queue")
+        self._queues = {}
+
+    async def async_load(self):
+        """从磁盘加载队列."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        self._queues = {
+            endpoint: deque(items)
+            for endpoint, items in stored.get("queues", {}).items()
+        }
+
+    def size(self, endpoint):
+        """返回端点队列中剩余的条目数."""
+        return len(self._queues.get(endpoint, ()))
+
+    @callback
+    def pop(self, endpoint):
+        """取出端点队列中最早的一条内容，队列为空时返回None."""
+        queue = self._queues.get(endpoint)
+        if not queue:
+            return None
+
+        item = queue.popleft()
+        self._async_schedule_save()
+        return item
+
+    @callback
+    def extend(self, endpoint, items):
+        """将批量获取的内容追加到端点队列."""
+        self._queues.setdefault(endpoint, deque()).extend(items)
+        self._async_schedule_save()
+        _LOGGER.debug("端点 %s 队列补充 %d 条，当前 %d 条", endpoint, len(items), self.size(endpoint))
+
+    @property
+    def stats(self):
+        """返回各端点队列长度."""
+        return {endpoint: len(queue) for endpoint, queue in self._queues.items()}
+
+    async def async_flush(self):
+        """立即保存队列到磁盘."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self):
+        """删除磁盘上的队列文件."""
+        self._queues = {}
+        await self._store.async_remove()
+
+    @callback
+    def _async_schedule_save(self):
+        """延迟保存队列到磁盘."""
+        self._store.async_delay_save(self._data_to_save, QUEUE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self):
+        """返回需要保存的数据."""
+        return {
+            "queues": {endpoint: list(queue) for endpoint, queue in self._queues.items()},
+        }
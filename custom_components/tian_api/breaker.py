@@ -0,0 +1,152 @@
+"""Circuit breakers for Tian API integration."""
+import logging
+import random
+import time
+
+from .const import BREAKER_BASE_DELAY, BREAKER_MAX_DELAY, RATE_LIMIT_COOLDOWN
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """带抖动指数退避的熔断器，恢复前只放行一个探测请求."""
+
+    def __init__(self, name: str):
+        """Initialize the breaker."""
+        self.name = name
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._open_until = 0.0
+        self._probing = False
+
+    def can_attempt(self, now: float) -> bool:
+        """检查当前是否允许发起请求（不占用探测名额）."""
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN:
+            return now >= self._open_until
+        return not self._probing
+
+    def begin_attempt(self, now: float):
+        """开始一次请求，冷却结束后的首个请求作为探测请求."""
+        if self.state == STATE_OPEN and now >= self._open_until:
+            self.state = STATE_HALF_OPEN
+        if self.state == STATE_HALF_OPEN:
+            self._probing = True
+            _LOGGER.debug("熔断器 %s 发起探测请求", self.name)
+
+    def record_success(self):
+        """请求成功，关闭熔断器."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("熔断器 %s 已恢复", self.name)
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self, now: float):
+        """请求失败，按指数退避打开熔断器."""
+        self.failures += 1
+        delay = min(BREAKER_BASE_DELAY * 2 ** (self.failures - 1), BREAKER_MAX_DELAY)
+        # 在退避时间的后半段随机取值，避免多个端点同时重试
+        self._open(now, delay * random.uniform(0.5, 1.0))
+
+    def trip(self, now: float, cooldown: float):
+        """立即打开熔断器并冷却指定时间."""
+        self.failures += 1
+        self._open(now, cooldown)
+
+    def release(self):
+        """请求未得出结论（如被其他限制跳过）时归还探测名额."""
+        self._probing = False
+
+    @property
+    def retry_in(self) -> float:
+        """距离允许重试的剩余秒数."""
+        if self.state != STATE_OPEN:
+            return 0
+        return max(self._open_until - time.monotonic(), 0)
+
+    def as_dict(self):
+        """返回熔断器状态."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(self.retry_in),
+        }
+
+    def _open(self, now: float, delay: float):
+        """打开熔断器."""
+        self.state = STATE_OPEN
+        self._open_until = now + delay
+        self._probing = False
+        _LOGGER.warning("熔断器 %s 已打开，%d 秒后重试", self.name, delay)
+
+
+class TianCircuitBreakers:
+    """按端点和API密钥两级管理熔断器."""
+
+    def __init__(self):
+        """Initialize the breakers."""
+        self.key = CircuitBreaker("api_key")
+        self._endpoints = {}
+
+    def endpoint(self, endpoint: str) -> CircuitBreaker:
+        """获取端点熔断器."""
+        if endpoint not in self._endpoints:
+            self._endpoints[endpoint] = CircuitBreaker(endpoint)
+        return self._endpoints[endpoint]
+
+    def try_acquire(self, endpoint: str) -> bool:
+        """密钥和端点熔断器都允许时占用一次请求."""
+        now = time.monotonic()
+        breaker = self.endpoint(endpoint)
+        if not (self.key.can_attempt(now) and breaker.can_attempt(now)):
+            return False
+
+        self.key.begin_attempt(now)
+        breaker.begin_attempt(now)
+        return True
+
+    def is_open(self, endpoint: str) -> bool:
+        """检查密钥或端点熔断器当前是否拒绝请求."""
+        now = time.monotonic()
+        return not (self.key.can_attempt(now) and self.endpoint(endpoint).can_attempt(now))
+
+    def release(self, endpoint: str):
+        """归还未实际发出的请求占用的探测名额."""
+        self.key.release()
+        self.endpoint(endpoint).release()
+
+    def record_success(self, endpoint: str):
+        """记录请求成功."""
+        self.key.record_success()
+        self.endpoint(endpoint).record_success()
+
+    def record_endpoint_failure(self, endpoint: str):
+        """超时、HTTP错误等只影响单个端点的失败."""
+        self.key.release()
+        self.endpoint(endpoint).record_failure(time.monotonic())
+
+    def record_key_failure(self, endpoint: str):
+        """密钥错误，该密钥下所有端点一起退避."""
+        self.endpoint(endpoint).release()
+        self.key.record_failure(time.monotonic())
+
+    def record_rate_limited(self, endpoint: str):
+        """频率超限，该密钥下所有端点共享冷却时间."""
+        self.endpoint(endpoint).release()
+        self.key.trip(time.monotonic(), RATE_LIMIT_COOLDOWN)
+
+    def as_dict(self):
+        """返回所有熔断器状态."""
+        return {
+            "key": self.key.as_dict(),
+            "endpoints": {
+                name: breaker.as_dict()
+                for name, breaker in self._endpoints.items()
+            },
+        }
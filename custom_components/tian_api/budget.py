@@ -0,0 +1,137 @@
+"""Daily request budget for Tian API integration."""
+import logging
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, BUDGET_STORAGE_VERSION, BUDGET_SAVE_DELAY, BUDGET_RESERVE_RATIO
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TianRequestBudget:
+    """按自然日统计各端点调用次数的配额管理器."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, daily_limit: int):
+        """Initialize the budget."""
+        self._store = Store(hass, BUDGET_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.budget")
+        self.daily_limit = daily_limit
+        # 保留给当前时段端点和最重要端点的额度，其他请求不能占用
+        self.reserve = max(round(daily_limit * BUDGET_RESERVE_RATIO), 1)
+        self._date = self._today()
+        self._counts = {}
+        self._exhausted = False
+
+    async def async_load(self):
+        """从磁盘加载当天的调用统计."""
+        stored = await self._store.async_load()
+        if not stored or stored.get("date") != self._today():
+            return
+
+        self._date = stored["date"]
+        self._counts = stored.get("counts", {})
+        self._exhausted = stored.get("exhausted", False)
+
+    @property
+    def used(self):
+        """当天已调用次数."""
+        self._roll_over()
+        return sum(self._counts.values())
+
+    @property
+    def remaining(self):
+        """当天剩余可调用次数."""
+        self._roll_over()
+        if self._exhausted:
+            return 0
+        return max(self.daily_limit - self.used, 0)
+
+    def available(self, reserved=False):
+        """返回可用的调用次数，reserved为False时不含保留额度."""
+        if reserved:
+            return self.remaining
+        return max(self.remaining - self.reserve, 0)
+
+    @callback
+    def async_consume(self, endpoint, reserved=False):
+        """占用一次调用额度，额度不足时返回False.
+
+        reserved为True时可以使用保留额度，用于当前时段和最重要的端点。
+        """
+        if self.available(reserved) <= 0:
+            return False
+
+        self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+        self._async_schedule_save()
+        return True
+
+    @callback
+    def async_mark_exhausted(self):
+        """接口返回可用次数不足（错误码150）时，当天不再发起请求."""
+        self._roll_over()
+        if not self._exhausted:
+            _LOGGER.warning("天聚数行当日调用额度已用尽，将使用缓存数据")
+        self._exhausted = True
+        self._async_schedule_save()
+
+    def forecast(self, now=None):
+        """按当天已用速度预测全天调用次数."""
+        if now is None:
+            now = datetime.now()
+        elapsed = now.hour * 3600 + now.minute * 60 + now.second
+        # 凌晨数据太少时至少按一小时计算，避免预测值失真
+        fraction = max(elapsed, 3600) / 86400
+        projected = round(self.used / fraction)
+        return {
+            "projected_used": projected,
+            "projected_remaining": self.daily_limit - projected,
+        }
+
+    def as_dict(self):
+        """返回配额统计信息."""
+        return {
+            "date": self._date,
+            "daily_limit": self.daily_limit,
+            "used": self.used,
+            "remaining": self.remaining,
+            "reserve": self.reserve,
+            "exhausted": self._exhausted,
+            "endpoints": dict(self._counts),
+            **self.forecast(),
+        }
+
+    async def async_flush(self):
+        """立即保存统计到磁盘."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self):
+        """删除磁盘上的统计文件."""
+        await self._store.async_remove()
+
+    def _roll_over(self):
+        """跨天时重置统计."""
+        today = self._today()
+        if today != self._date:
+            self._date = today
+            self._counts = {}
+            self._exhausted = False
+
+    @callback
+    def _async_schedule_save(self):
+        """延迟保存统计到磁盘."""
+        self._store.async_delay_save(self._data_to_save, BUDGET_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self):
+        """返回需要保存的数据."""
+        return {
+            "date": self._date,
+            "counts": self._counts,
+            "exhausted": self._exhausted,
+        }
+
+    @staticmethod
+    def _today():
+        """返回当天日期字符串."""
+        return datetime.now().strftime("%Y-%m-%d")
@@ -0,0 +1,200 @@
+"""Response cache for Tian API integration."""
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from urllib.parse import urlencode
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    CACHE_STORAGE_VERSION,
+    CACHE_SAVE_DELAY,
+    CACHE_MAX_ENTRIES,
+    CACHE_MAX_BYTES,
+)
+from .endpoints import ENDPOINTS, make_record, normalize
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def make_cache_key(endpoint, params=None):
+    """由端点和查询参数生成缓存键."""
+    if not params:
+        return endpoint
+    return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+
+def _key_endpoint(key):
+    """返回缓存键对应的端点."""
+    return key.split("?", 1)[0]
+
+
+class _TianCacheStore(Store):
+    """缓存存储，负责旧版本数据迁移."""
+
+    async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
+        """迁移旧版本缓存数据."""
+        entries = old_data.get("entries", {})
+        if old_major_version < 2:
+            # 版本1仅以端点名作为键，且没有记录数据大小
+            migrated = {}
+            for endpoint, entry in entries.items():
+                if endpoint not in ENDPOINTS:
+                    continue
+                entry["size"] = _payload_size(entry["data"])
+                migrated[make_cache_key(endpoint, ENDPOINTS[endpoint].params)] = entry
+            entries = migrated
+        if old_major_version < 3:
+            # 版本3只保存规范化后的记录字段，不再保存完整的API响应
+            migrated = {}
+            for key, entry in entries.items():
+                endpoint = _key_endpoint(key)
+                record = normalize(endpoint, entry["data"]) if endpoint in ENDPOINTS else None
+                if record is None:
+                    continue
+                entry["data"] = record.as_dict()
+                entry["size"] = _payload_size(entry["data"])
+                migrated[key] = entry
+            entries = migrated
+        return {"entries": entries}
+
+
+class TianResponseCache:
+    """按配置条目持久化保存、有容量上限的LRU响应缓存."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str,
+                 max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        """Initialize the cache."""
+        # 每个配置条目使用独立的存储文件
+        self._store = _TianCacheStore(hass, CACHE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.cache")
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def async_load(self):
+        """从磁盘加载缓存."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        # 按获取时间排序，最近获取的视为最近使用
+        entries = sorted(stored.get("entries", {}).items(), key=lambda item: item[1]["fetched_at"])
+        self._entries = OrderedDict(
+            (key, {**entry, "data": make_record(_key_endpoint(key), entry["data"])})
+            for key, entry in entries
+            if _key_endpoint(key) in ENDPOINTS
+        )
+        self._bytes = sum(entry["size"] for entry in self._entries.values())
+        self._evict()
+        _LOGGER.debug("已加载持久化缓存: %s", list(self._entries))
+
+    def get(self, key, max_age=None):
+        """获取缓存的记录，不存在或超过max_age时返回None."""
+        entry = self._entries.get(key)
+        if entry is None or (max_age is not None and self.age(key) >= max_age):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry["data"]
+
+    def peek(self, key, max_age=None):
+        """获取缓存的记录，不计入命中统计也不调整淘汰顺序."""
+        entry = self._entries.get(key)
+        if entry is None or (max_age is not None and self.age(key) >= max_age):
+            return None
+        return entry["data"]
+
+    def fetched_at(self, key):
+        """返回缓存的获取时间戳，不存在时返回None."""
+        entry = self._entries.get(key)
+        return entry["fetched_at"] if entry else None
+
+    def age(self, key, now=None):
+        """返回缓存已存在的秒数，不存在时返回None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if now is None:
+            now = int(datetime.now().timestamp())
+        return now - entry["fetched_at"]
+
+    @callback
+    def set(self, key, data, ttl):
+        """写入记录并延迟保存到磁盘."""
+        self._discard(key)
+        size = _payload_size(data.as_dict())
+        self._entries[key] = {
+            "data": data,
+            "fetched_at": int(datetime.now().timestamp()),
+            "ttl": ttl,
+            "size": size,
+        }
+        self._bytes += size
+        self._evict()
+        self._store.async_delay_save(self._data_to_save, CACHE_SAVE_DELAY)
+
+    @property
+    def stats(self):
+        """返回缓存统计信息."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    async def async_close(self):
+        """保存缓存并释放内存."""
+        await self._store.async_save(self._data_to_save())
+        self._entries.clear()
+        self._bytes = 0
+
+    async def async_remove(self):
+        """删除磁盘上的缓存文件."""
+        self._entries.clear()
+        self._bytes = 0
+        await self._store.async_remove()
+
+    def _discard(self, key):
+        """移除一条缓存."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["size"]
+
+    def _evict(self):
+        """超出条目数或内存上限时淘汰最久未使用的缓存."""
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._bytes > self._max_bytes
+        ):
+            key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry["size"]
+            self.evictions += 1
+            _LOGGER.debug("淘汰缓存: %s", key)
+
+    @callback
+    def _data_to_save(self):
+        """返回需要保存的数据."""
+        return {
+            "entries": {
+                key: {**entry, "data": entry["data"].as_dict()}
+                for key, entry in self._entries.items()
+            },
+        }
+
+
+def _payload_size(data):
+    """估算数据占用的字节数."""
+    return len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
@@ -1,14 +1,71 @@
 """Config flow for Tian API integration."""
+import asyncio
+import logging
+
+import async_timeout
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
-from .const import DOMAIN, NAME, CONF_API_KEY
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
+from .const import (
+    DOMAIN,
+    NAME,
+    CONF_API_KEY,
+    CONF_DAILY_QUOTA,
+    CONF_SOFT_TTL,
+    CONF_HARD_TTL,
+    CONF_PREFETCH_LEAD,
+    CONF_BATCH_SIZE,
+    CONF_NO_REPEAT_DAYS,
+    CONF_SCROLLING_SCHEDULE,
+    CONF_UPDATE_MODE,
+    CONF_ITEM_SENSORS,
+    CONF_PROFILE,
+    CONF_ENDPOINT_POLICIES,
+    DEFAULT_DAILY_QUOTA,
+    DEFAULT_SOFT_TTL,
+    DEFAULT_HARD_TTL,
+    DEFAULT_PREFETCH_LEAD,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_NO_REPEAT_DAYS,
+    DEFAULT_UPDATE_MODE,
+    DEFAULT_ITEM_SENSORS,
+    DEFAULT_PROFILE,
+    PROFILE_FULL,
+    PROFILE_CLASSIC,
+    UPDATE_MODE_ALWAYS,
+    UPDATE_MODE_ON_CHANGE,
+    POLICY_OFF,
+    VALIDATE_ENDPOINT,
+    VALIDATE_TIMEOUT,
+    DATA_WARM_CACHE,
+)
+from .api import (
+    TianApiClient,
+    TianApiError,
+    TianApiConnectionError,
+    TianApiRateLimitError,
+    TianApiQuotaExceededError,
+)
+from .endpoints import ENDPOINTS, PROFILES, record_fields
+from .policy import format_policy, parse_policy, resolve_policies
+from .schedule import TianSlotSchedule, format_schedule_text, parse_schedule_text
+
+_LOGGER = logging.getLogger(__name__)
+
 
 class TianConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Tian API."""
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return TianOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
@@ -16,14 +73,18 @@ class TianConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             api_key = user_input[CONF_API_KEY].strip()
             
-            # 简单验证API密钥长度
-            if len(api_key) == 32:
-                return self.async_create_entry(
-                    title=NAME,
-                    data={CONF_API_KEY: api_key}
-                )
-            else:
+            # 先验证API密钥长度，再调用一个端点确认密钥可用
+            if len(api_key) != 32:
                 errors["base"] = "invalid_api_key_format"
+            else:
+                error = await self._async_validate_api_key(api_key)
+                if error:
+                    errors["base"] = error
+                else:
+                    return self.async_create_entry(
+                        title=NAME,
+                        data={CONF_API_KEY: api_key}
+                    )
 
         data_schema = vol.Schema({
             vol.Required(CONF_API_KEY): str,
@@ -36,4 +97,181 @@ class TianConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders={
                 "name": NAME
             }
-        )
\ No newline at end of file
+        )
+
+    async def _async_validate_api_key(self, api_key):
+        """在限定时间内请求一个端点验证密钥，返回错误代码，成功的响应暂存为新条目的初始缓存."""
+        endpoint = VALIDATE_ENDPOINT
+        spec = ENDPOINTS[endpoint]
+        client = TianApiClient(async_get_clientsession(self.hass), api_key)
+        try:
+            async with async_timeout.timeout(VALIDATE_TIMEOUT):
+                data = await client.async_fetch(spec.url, spec.params, record_fields(endpoint))
+        except (TianApiRateLimitError, TianApiQuotaExceededError):
+            # 频率超限或次数不足说明密钥本身有效
+            return None
+        except (asyncio.TimeoutError, TianApiConnectionError):
+            return "cannot_connect"
+        except TianApiError as e:
+            _LOGGER.warning("API密钥验证失败: %s", e)
+            return "invalid_api_key"
+
+        self.hass.data.setdefault(DATA_WARM_CACHE, {})[api_key] = (endpoint, data)
+        return None
+
+
+class TianOptionsFlow(config_entries.OptionsFlow):
+    """Handle Tian API options."""
+
+    def __init__(self, config_entry):
+        """Initialize options flow."""
+        self._entry = config_entry
+        self._options = {}
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        errors = {}
+        placeholders = {"schedule_error": ""}
+        options = self._entry.options
+        profile = options.get(CONF_PROFILE, DEFAULT_PROFILE)
+        schedule_text = format_schedule_text(
+            options.get(CONF_SCROLLING_SCHEDULE, PROFILES[profile][1])
+        )
+
+        if user_input is not None:
+            default_schedule = PROFILES[user_input[CONF_PROFILE]][1]
+            # 切换内容组合且未修改时段表时，改用新内容组合的默认时段表
+            if user_input[CONF_PROFILE] != profile and (
+                user_input[CONF_SCROLLING_SCHEDULE].strip() == schedule_text
+            ):
+                user_input[CONF_SCROLLING_SCHEDULE] = format_schedule_text(default_schedule)
+            profile = user_input[CONF_PROFILE]
+            schedule_text = user_input[CONF_SCROLLING_SCHEDULE]
+            # 时段表需覆盖全天且时段之间没有空档或重叠，使用的端点在下一步检查是否启用
+            try:
+                schedule = parse_schedule_text(schedule_text)
+                TianSlotSchedule(schedule)
+            except ValueError as err:
+                errors[CONF_SCROLLING_SCHEDULE] = "invalid_schedule"
+                placeholders["schedule_error"] = str(err)
+
+            # 硬过期时间不能短于软过期时间
+            if user_input[CONF_HARD_TTL] < user_input[CONF_SOFT_TTL]:
+                errors["base"] = "hard_ttl_too_short"
+
+            if not errors:
+                self._options = {**user_input, CONF_SCROLLING_SCHEDULE: schedule}
+                return await self.async_step_endpoints()
+
+        data_schema = vol.Schema({
+            vol.Required(
+                CONF_PROFILE,
+                default=profile,
+            ): vol.In({
+                PROFILE_FULL: "全部内容",
+                PROFILE_CLASSIC: "不含谜语和笑话",
+            }),
+            vol.Required(
+                CONF_DAILY_QUOTA,
+                default=options.get(CONF_DAILY_QUOTA, DEFAULT_DAILY_QUOTA),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Required(
+                CONF_SOFT_TTL,
+                default=options.get(CONF_SOFT_TTL, DEFAULT_SOFT_TTL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+            vol.Required(
+                CONF_HARD_TTL,
+                default=options.get(CONF_HARD_TTL, DEFAULT_HARD_TTL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+            vol.Required(
+                CONF_PREFETCH_LEAD,
+                default=options.get(CONF_PREFETCH_LEAD, DEFAULT_PREFETCH_LEAD),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=120)),
+            vol.Required(
+                CONF_BATCH_SIZE,
+                default=options.get(CONF_BATCH_SIZE, DEFAULT_BATCH_SIZE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+            vol.Required(
+                CONF_NO_REPEAT_DAYS,
+                default=options.get(CONF_NO_REPEAT_DAYS, DEFAULT_NO_REPEAT_DAYS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=365)),
+            vol.Required(
+                CONF_SCROLLING_SCHEDULE,
+                default=schedule_text,
+            ): TextSelector(TextSelectorConfig(multiline=True)),
+            vol.Required(
+                CONF_UPDATE_MODE,
+                default=options.get(CONF_UPDATE_MODE, DEFAULT_UPDATE_MODE),
+            ): vol.In({
+                UPDATE_MODE_ALWAYS: "每次获取数据时更新",
+                UPDATE_MODE_ON_CHANGE: "内容变化时才更新",
+            }),
+            vol.Required(
+                CONF_ITEM_SENSORS,
+                default=options.get(CONF_ITEM_SENSORS, DEFAULT_ITEM_SENSORS),
+            ): bool,
+        })
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders=placeholders,
+        )
+
+    async def async_step_endpoints(self, user_input=None):
+        """设置各端点的刷新方式，关闭的端点不再获取."""
+        errors = {}
+        placeholders = {"endpoints": ""}
+        profile = self._options[CONF_PROFILE]
+        # 切换内容组合后按新内容组合的默认值显示
+        stored = {}
+        if profile == self._entry.options.get(CONF_PROFILE, DEFAULT_PROFILE):
+            stored = self._entry.options.get(CONF_ENDPOINT_POLICIES, {})
+        policies = {
+            endpoint: format_policy(policy)
+            for endpoint, policy in resolve_policies(profile, stored).items()
+        }
+
+        if user_input is not None:
+            policies = user_input
+            parsed = {}
+            for endpoint, text in user_input.items():
+                try:
+                    parsed[endpoint] = parse_policy(text)
+                except ValueError:
+                    errors[endpoint] = "invalid_policy"
+
+            # 时段表不能使用已关闭的端点
+            if not errors:
+                disabled = sorted({
+                    endpoint
+                    for _start, _end, endpoint in self._options[CONF_SCROLLING_SCHEDULE]
+                    if parsed[endpoint].mode == POLICY_OFF
+                })
+                if disabled:
+                    errors["base"] = "schedule_endpoint_disabled"
+                    placeholders["endpoints"] = "、".join(disabled)
+
+            if not errors:
+                return self.async_create_entry(
+                    title="",
+                    data={
+                        **self._options,
+                        CONF_ENDPOINT_POLICIES: {
+                            endpoint: format_policy(policy) for endpoint, policy in parsed.items()
+                        },
+                    },
+                )
+
+        data_schema = vol.Schema({
+            vol.Required(endpoint, default=policies[endpoint]): str
+            for endpoint in ENDPOINTS
+        })
+
+        return self.async_show_form(
+            step_id="endpoints",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders=placeholders,
+        )
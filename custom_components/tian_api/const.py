@@ -5,19 +5,142 @@ NAME = "天聚数行API"
 VERSION = "1.1.1"
 
 CONF_API_KEY = "api_key"
+CONF_DAILY_QUOTA = "daily_quota"
+CONF_SOFT_TTL = "soft_ttl"
+CONF_HARD_TTL = "hard_ttl"
+CONF_PREFETCH_LEAD = "prefetch_lead"
+CONF_BATCH_SIZE = "batch_size"
+CONF_NO_REPEAT_DAYS = "no_repeat_days"
+CONF_SCROLLING_SCHEDULE = "scrolling_schedule"
+CONF_UPDATE_MODE = "update_mode"
+CONF_ITEM_SENSORS = "item_sensors"
+CONF_PROFILE = "profile"
+CONF_ENDPOINT_POLICIES = "endpoint_policies"
 
-# API endpoints
-RIDDLE_API_URL = "https://apis.tianapi.com/caizimi/index"
-JOKE_API_URL = "https://apis.tianapi.com/joke/index"
-MORNING_API_URL = "https://apis.tianapi.com/zaoan/index"
-EVENING_API_URL = "https://apis.tianapi.com/wanan/index"
-POETRY_API_URL = "https://apis.tianapi.com/poetry/index"
-SONG_CI_API_URL = "https://apis.tianapi.com/zmsc/index"
-YUAN_QU_API_URL = "https://apis.tianapi.com/yuanqu/index"
-HISTORY_API_URL = "https://apis.tianapi.com/pitlishi/index"
-SENTENCE_API_URL = "https://apis.tianapi.com/gjmj/index"
-COUPLET_API_URL = "https://apis.tianapi.com/duilian/index"
-MAXIM_API_URL = "https://apis.tianapi.com/enmaxim/index"
+# 内容组合
+PROFILE_FULL = "full"  # 全部内容
+PROFILE_CLASSIC = "classic"  # 不含谜语和笑话
+
+# 端点刷新方式
+POLICY_OFF = "off"  # 不获取
+POLICY_AUTO = "auto"  # 时段表中的端点由时段预取刷新，其余随协调器更新，使用缓存软过期时间
+POLICY_DAILY = "daily"  # 每天在指定时间刷新
+POLICY_EVERY = "every"  # 每隔N小时刷新
+POLICY_MANUAL = "manual"  # 只在调用刷新服务或没有缓存时获取
+
+# 实体状态更新方式
+UPDATE_MODE_ALWAYS = "always"  # 每次获取数据都写入状态
+UPDATE_MODE_ON_CHANGE = "on_change"  # 内容变化时才写入状态
+
+DEFAULT_DAILY_QUOTA = 100
+DEFAULT_SOFT_TTL = 3600  # 超过后先返回旧数据并在后台刷新
+DEFAULT_HARD_TTL = 3 * 24 * 3600  # 超过后旧数据不再使用
+DEFAULT_PREFETCH_LEAD = 10  # 时段开始前提前获取的分钟数
+DEFAULT_BATCH_SIZE = 7  # 每次批量获取的条数
+DEFAULT_NO_REPEAT_DAYS = 7  # 该天数内不重复展示同一内容，0为不限制
+DEFAULT_UPDATE_MODE = UPDATE_MODE_ALWAYS
+DEFAULT_ITEM_SENSORS = False  # 是否为每项内容单独创建传感器
+DEFAULT_PROFILE = PROFILE_FULL
+
+# 批量获取
+BATCH_LOW_WATER = 2  # 队列低于该条数时在后台补充
+
+# 避免重复展示
+NO_REPEAT_MAX_ATTEMPTS = 3  # 内容重复时最多获取的次数
+
+# 全文检索
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 100
+
+# 服务
+SERVICE_SEARCH = "search"
+SERVICE_REFRESH = "refresh"
+
+# 刷新服务返回的结果代码
+REFRESH_CACHED = "cached"  # 缓存仍在软过期时间内，未调用API
+REFRESH_UPDATED = "updated"  # 已获取新内容
+REFRESH_JOINED = "joined"  # 合并到正在进行的相同请求
+REFRESH_QUOTA_EXHAUSTED = "quota_exhausted"  # 调用额度已用尽
+REFRESH_CIRCUIT_OPEN = "circuit_open"  # 熔断器冷却中
+REFRESH_FAILED = "failed"  # 请求失败
+REFRESH_DISABLED = "disabled"  # 端点不在内容组合中
+
+# 默认滚动内容时段表：[开始时间, 结束时间, 数据来源端点]，可在集成选项中修改
+DEFAULT_SCROLLING_SCHEDULE = [
+    ["05:30", "08:30", "morning"],
+    ["08:30", "11:00", "maxim"],
+    ["11:00", "13:00", "joke"],
+    ["13:00", "14:00", "sentence"],
+    ["14:00", "15:00", "couplet"],
+    ["15:00", "17:00", "history"],
+    ["17:00", "18:30", "poetry"],
+    ["18:30", "20:30", "songci"],
+    ["20:30", "21:00", "yuanqu"],
+    ["21:00", "22:00", "riddle"],
+    ["22:00", "05:30", "evening"],
+]
+
+# 不含谜语和笑话的内容组合使用的默认时段表
+CLASSIC_SCROLLING_SCHEDULE = [
+    ["05:30", "08:30", "morning"],
+    ["08:30", "11:00", "maxim"],
+    ["11:00", "13:00", "sentence"],
+    ["13:00", "14:00", "couplet"],
+    ["14:00", "15:00", "history"],
+    ["15:00", "17:00", "poetry"],
+    ["17:00", "18:30", "songci"],
+    ["18:30", "21:00", "yuanqu"],
+    ["21:00", "05:30", "evening"],
+]
+
+# 配置时验证API密钥：请求一个端点，成功的响应交给新条目作为初始缓存
+VALIDATE_ENDPOINT = "morning"
+VALIDATE_TIMEOUT = 10  # 秒
+# hass.data中暂存验证响应的键（hass.data[DOMAIN]只保存协调器）
+DATA_WARM_CACHE = f"{DOMAIN}_warm_cache"
+
+# 更新与缓存
+UPDATE_INTERVAL = 24 * 3600  # 每天更新一次
+MAX_CONCURRENT_REQUESTS = 4  # 同时进行的API请求上限
+
+# 集成专用的HTTP连接池
+HTTP_LIMIT_PER_HOST = MAX_CONCURRENT_REQUESTS  # 每个主机的连接数上限
+HTTP_KEEPALIVE_TIMEOUT = 60  # 空闲连接保持时间（秒）
+HTTP_DNS_CACHE_TTL = 300  # DNS缓存时间（秒）
+HTTP_CONNECT_TIMEOUT = 5  # 建立连接超时（秒）
+HTTP_READ_TIMEOUT = 10  # 读取响应超时（秒）
+
+# API响应
+API_MAX_BODY_BYTES = 256 * 1024  # 响应体大小上限
+API_DEBUG_LOG_CHARS = 500  # 调试日志中响应内容的最大长度
+
+# 熔断与退避（秒）
+BREAKER_BASE_DELAY = 60
+BREAKER_MAX_DELAY = 6 * 3600
+RATE_LIMIT_COOLDOWN = 300
+
+# 持久化缓存
+CACHE_STORAGE_VERSION = 3
+CACHE_SAVE_DELAY = 10  # 秒
+CACHE_MAX_ENTRIES = 64
+CACHE_MAX_BYTES = 512 * 1024
+
+# 批量内容队列
+QUEUE_STORAGE_VERSION = 1
+QUEUE_SAVE_DELAY = 10  # 秒
+
+# 近期展示记录
+RECENT_STORAGE_VERSION = 1
+RECENT_SAVE_DELAY = 10  # 秒
+
+# 调用配额统计
+BUDGET_STORAGE_VERSION = 1
+BUDGET_SAVE_DELAY = 10  # 秒
+BUDGET_RESERVE_RATIO = 0.1  # 保留给当前时段和最重要端点的额度比例
+
+# 实体属性大小上限（Home Assistant 超过16KB不写入历史记录），留出新鲜度等属性的空间
+ITEM_ATTRIBUTES_MAX_BYTES = 15 * 1024
+STATE_MAX_LENGTH = 255
 
 # Device info
 DEVICE_NAME = "天聚信息查询"
@@ -0,0 +1,526 @@
+"""Data update coordinator for Tian API integration."""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import (
+    create_session,
+    TianApiClient,
+    TianApiError,
+    TianApiAuthError,
+    TianApiRateLimitError,
+    TianApiQuotaExceededError,
+)
+from .breaker import TianCircuitBreakers
+from .budget import TianRequestBudget
+from .batch import TianContentQueue
+from .cache import TianResponseCache, make_cache_key
+from .corpus import TianContentCorpus
+from .policy import resolve_policies
+from .recent import TianRecentContent
+from .endpoints import (
+    ENDPOINTS,
+    PROFILES,
+    SEARCH_ENDPOINTS,
+    extract_items,
+    make_record,
+    normalize,
+    record_fields,
+)
+from .records import content_hash
+from .schedule import TianSlotSchedule
+from .search import TianSearchIndex
+from .const import (
+    DOMAIN,
+    CONF_API_KEY,
+    CONF_DAILY_QUOTA,
+    CONF_SOFT_TTL,
+    CONF_PREFETCH_LEAD,
+    CONF_HARD_TTL,
+    CONF_BATCH_SIZE,
+    CONF_NO_REPEAT_DAYS,
+    CONF_SCROLLING_SCHEDULE,
+    CONF_PROFILE,
+    CONF_ENDPOINT_POLICIES,
+    DEFAULT_DAILY_QUOTA,
+    DEFAULT_SOFT_TTL,
+    DEFAULT_PREFETCH_LEAD,
+    DEFAULT_HARD_TTL,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_NO_REPEAT_DAYS,
+    DEFAULT_PROFILE,
+    DATA_WARM_CACHE,
+    POLICY_OFF,
+    POLICY_AUTO,
+    POLICY_DAILY,
+    POLICY_EVERY,
+    POLICY_MANUAL,
+    REFRESH_CACHED,
+    REFRESH_UPDATED,
+    REFRESH_JOINED,
+    REFRESH_QUOTA_EXHAUSTED,
+    REFRESH_CIRCUIT_OPEN,
+    REFRESH_FAILED,
+    BATCH_LOW_WATER,
+    NO_REPEAT_MAX_ATTEMPTS,
+    UPDATE_INTERVAL,
+    MAX_CONCURRENT_REQUESTS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TianDataUpdateCoordinator(DataUpdateCoordinator):
+    """统一获取天聚数行所有端点数据的协调器."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+        )
+        self.entry = entry
+        # 使用集成专用的连接池，卸载时关闭
+        self.client = TianApiClient(create_session(), entry.data[CONF_API_KEY])
+        self.cache = TianResponseCache(hass, entry.entry_id)
+        self.soft_ttl = entry.options.get(CONF_SOFT_TTL, DEFAULT_SOFT_TTL)
+        self.hard_ttl = entry.options.get(CONF_HARD_TTL, DEFAULT_HARD_TTL)
+        self.prefetch_lead = entry.options.get(CONF_PREFETCH_LEAD, DEFAULT_PREFETCH_LEAD)
+        self.breakers = TianCircuitBreakers()
+        # 内容组合决定默认启用的端点和默认时段表，各端点可单独设置刷新方式或关闭
+        profile = entry.options.get(CONF_PROFILE, DEFAULT_PROFILE)
+        default_schedule = PROFILES[profile][1]
+        self.policies = resolve_policies(profile, entry.options.get(CONF_ENDPOINT_POLICIES, {}))
+        self.endpoints = tuple(
+            endpoint for endpoint, policy in self.policies.items() if policy.mode != POLICY_OFF
+        )
+        self.schedule = self._compile_schedule(
+            entry.options.get(CONF_SCROLLING_SCHEDULE, default_schedule),
+            self.endpoints,
+            default_schedule,
+        )
+        self.queue = TianContentQueue(hass, entry.entry_id)
+        self.corpus = TianContentCorpus(hass, entry.entry_id)
+        self.search_index = TianSearchIndex()
+        self.batch_size = entry.options.get(CONF_BATCH_SIZE, DEFAULT_BATCH_SIZE)
+        self._refills = {}
+        self.recent = TianRecentContent(
+            hass,
+            entry.entry_id,
+            entry.options.get(CONF_NO_REPEAT_DAYS, DEFAULT_NO_REPEAT_DAYS),
+        )
+        self.budget = TianRequestBudget(
+            hass,
+            entry.entry_id,
+            entry.options.get(CONF_DAILY_QUOTA, DEFAULT_DAILY_QUOTA),
+        )
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # 合并请求：同一端点和参数的并发请求只调用一次API
+        self._inflight = {}
+        self.coalesced_requests = 0
+        # 请求、队列补充和语料库写入等后台任务，卸载时取消
+        self._tasks = set()
+        # 实体ID -> 实体，刷新服务据此确定实体使用的端点
+        self.entities = {}
+
+    @property
+    def request_stats(self):
+        """返回请求统计信息."""
+        return {
+            "in_flight": len(self._inflight),
+            "coalesced": self.coalesced_requests,
+        }
+
+    async def async_load_cache(self):
+        """在首次更新前加载持久化缓存、配额统计、内容队列、展示记录和语料库."""
+        await self.cache.async_load()
+        await self.budget.async_load()
+        await self.queue.async_load()
+        await self.recent.async_load()
+        await self.corpus.async_open()
+        # 由语料库重建检索索引，之后随每次获取增量更新
+        rows = await self.corpus.async_items(SEARCH_ENDPOINTS)
+        await self.hass.async_add_executor_job(self.search_index.add_many, rows)
+        self._async_apply_warm_cache()
+
+    @callback
+    def _async_apply_warm_cache(self):
+        """将配置流程验证密钥时获取的响应作为初始缓存，首次更新无需再请求该端点."""
+        warm = self.hass.data.get(DATA_WARM_CACHE, {}).pop(self.entry.data[CONF_API_KEY], None)
+        if warm is None:
+            return
+
+        endpoint, data = warm
+        # 验证请求已实际调用API，计入当天额度
+        self.budget.async_consume(endpoint, reserved=True)
+        self._async_ingest(endpoint, data)
+        record = normalize(endpoint, data)
+        key = self._cache_key(endpoint)
+        if record is None or endpoint not in self.endpoints or self.cache.age(key) is not None:
+            return
+
+        self._async_mark_shown(endpoint, record)
+        self.cache.set(key, record, self._soft_ttl(endpoint))
+        _LOGGER.debug("使用配置时获取的数据作为初始缓存: %s", endpoint)
+
+    async def async_unload(self):
+        """卸载时保存缓存、配额统计、内容队列和展示记录，并关闭语料库和HTTP会话."""
+        # 先结束未完成的后台任务，避免其在保存之后再写入缓存或队列
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.cache.async_close()
+        await self.budget.async_flush()
+        await self.queue.async_flush()
+        await self.recent.async_flush()
+        await self.corpus.async_close()
+        await self.client.async_close()
+
+    async def _async_update_data(self):
+        """获取所有端点数据."""
+        # 并发获取各端点数据，整体耗时取决于最慢的单个请求
+        # 按优先级顺序创建请求，配额不足时优先保证重要端点
+        keys = self._prioritized_endpoints()
+        payloads = await asyncio.gather(
+            *(self._fetch_cached_data(endpoint) for endpoint in keys)
+        )
+        # 等待期间完成的后台刷新已写入缓存，以缓存中的最新记录为准，避免被旧数据覆盖
+        data = {}
+        for endpoint, payload in zip(keys, payloads):
+            payload = self.cache.peek(self._cache_key(endpoint), max_age=self._hard_ttl(endpoint)) or payload
+            if payload:
+                data[endpoint] = payload
+
+        if not data:
+            raise UpdateFailed("无法获取天聚数行数据，请检查API密钥是否正确")
+
+        return data
+
+    def data_freshness(self, endpoints):
+        """返回指定端点中最旧数据的获取时间和时长."""
+        fetched = [self.cache.fetched_at(self._cache_key(endpoint)) for endpoint in endpoints]
+        if not fetched or None in fetched:
+            return None
+
+        now = int(datetime.now().timestamp())
+        oldest = min(fetched)
+        return {
+            "fetched_at": datetime.fromtimestamp(oldest).strftime("%Y-%m-%d %H:%M:%S"),
+            "data_age": now - oldest,
+            "stale": any(
+                not self._is_fresh(endpoint, now - timestamp)
+                for endpoint, timestamp in zip(endpoints, fetched)
+            ),
+        }
+
+    async def async_refresh_endpoint(self, endpoint, force=False):
+        """刷新单个端点并返回结果代码，未强制刷新且缓存仍在软过期时间内时直接使用缓存."""
+        key = self._cache_key(endpoint)
+        age = self.cache.age(key)
+        if not force and self._is_fresh(endpoint, age):
+            return REFRESH_CACHED
+
+        # 强制刷新同样经过合并请求、熔断和额度检查
+        joined = key in self._inflight
+        circuit_open = self.breakers.is_open(endpoint)
+        data = await asyncio.shield(self._async_request(endpoint))
+        if data is None:
+            if self.budget.available(self._is_reserved(endpoint)) <= 0:
+                return REFRESH_QUOTA_EXHAUSTED
+            return REFRESH_CIRCUIT_OPEN if circuit_open else REFRESH_FAILED
+
+        self._async_set_endpoint_data(endpoint, data)
+        return REFRESH_JOINED if joined else REFRESH_UPDATED
+
+    async def _fetch_cached_data(self, endpoint):
+        """获取缓存数据，避免重复调用API."""
+        key = self._cache_key(endpoint)
+        cached = self.cache.get(key, max_age=self._hard_ttl(endpoint))
+        age = self.cache.age(key)
+
+        # 软过期时间内直接使用缓存
+        if self._is_fresh(endpoint, age):
+            _LOGGER.debug("使用缓存数据: %s", endpoint)
+            return cached
+
+        # 由时段预取刷新的端点直接使用缓存，当前时段错过预取时除外
+        if (
+            cached is not None
+            and self._is_slot_driven(endpoint)
+            and endpoint != self.schedule.slot_at().endpoint
+        ):
+            _LOGGER.debug("等待时段预取刷新，使用缓存数据: %s", endpoint)
+            return cached
+
+        # 软过期后先返回旧数据，后台刷新完成时再通知实体
+        if cached is not None:
+            _LOGGER.debug("使用过期缓存并在后台刷新: %s", endpoint)
+            self._async_request(endpoint).add_done_callback(
+                lambda done: self._async_revalidated(endpoint, done)
+            )
+            return cached
+
+        # 无可用缓存时等待API结果
+        task = self._async_request(endpoint)
+
+        # shield避免单个调用方取消时中断其他调用方共享的请求
+        data = await asyncio.shield(task)
+        if data is None:
+            # 额度用尽或网络不可用时使用本地语料库中的内容，优先选择近期未展示的
+            data = (
+                await self.corpus.async_draw(endpoint, self._recent_hashes(endpoint))
+                or await self.corpus.async_draw(endpoint)
+            )
+            if data is not None:
+                _LOGGER.info("使用本地语料库内容: %s", endpoint)
+                self._async_mark_shown(endpoint, data)
+        return data
+
+    def _async_request(self, endpoint):
+        """发起或复用对端点的请求."""
+        flight_key = self._cache_key(endpoint)
+        task = self._inflight.get(flight_key)
+        if task is not None:
+            self.coalesced_requests += 1
+            _LOGGER.debug("合并重复请求: %s", endpoint)
+            return task
+
+        task = self._async_create_task(self._fetch_and_store(endpoint))
+        self._inflight[flight_key] = task
+        task.add_done_callback(lambda _task: self._inflight.pop(flight_key, None))
+        return task
+
+    @callback
+    def _async_create_task(self, coro):
+        """创建后台任务并记录，卸载时取消."""
+        task = self.hass.async_create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _async_revalidated(self, endpoint, task):
+        """后台刷新完成后更新协调器数据并通知实体."""
+        if task.cancelled() or task.exception() is not None:
+            return
+        if task.result() is None:
+            return
+
+        self._async_set_endpoint_data(endpoint, task.result())
+
+    @callback
+    def _async_set_endpoint_data(self, endpoint, data):
+        """更新单个端点的数据并通知实体.
+
+        首次更新尚未完成时数据已在缓存中，由_async_update_data读取。
+        """
+        if self.data is None:
+            return
+
+        self.data = {**self.data, endpoint: data}
+        self.async_update_listeners()
+
+    async def _fetch_and_store(self, endpoint):
+        """获取端点数据并写入缓存."""
+        data = await self._async_fetch_unseen(endpoint)
+        if data is None:
+            return None
+
+        self._async_mark_shown(endpoint, data)
+        self.cache.set(self._cache_key(endpoint), data, self._soft_ttl(endpoint))
+        _LOGGER.info("已更新缓存数据: %s", endpoint)
+        return data
+
+    async def _async_fetch_unseen(self, endpoint):
+        """获取一条近期未展示过的内容，多次重复时改用语料库中的其他内容."""
+        spec = ENDPOINTS[endpoint]
+        data = None
+        for _attempt in range(NO_REPEAT_MAX_ATTEMPTS):
+            if spec.batch_param:
+                fetched = await self._async_next_batch_item(endpoint)
+            else:
+                # 在获取时一次性转换为记录，缓存和实体只保存记录
+                fetched = normalize(endpoint, await self._async_call_api(endpoint, spec.params))
+
+            if fetched is None:
+                break
+            data = fetched
+            if not spec.no_repeat or not self.recent.is_repeat(endpoint, data):
+                return data
+            _LOGGER.debug("内容近期已展示过，重新获取: %s", endpoint)
+
+        if data is None:
+            return None
+
+        alternative = await self.corpus.async_draw(endpoint, self._recent_hashes(endpoint))
+        if alternative is not None:
+            _LOGGER.debug("使用语料库中近期未展示的内容: %s", endpoint)
+            return alternative
+        # 没有其他内容时仍使用重复的内容
+        return data
+
+    def _recent_hashes(self, endpoint):
+        """返回端点近期已展示内容的哈希集合."""
+        if not ENDPOINTS[endpoint].no_repeat:
+            return frozenset()
+        return self.recent.hashes(endpoint)
+
+    @callback
+    def _async_mark_shown(self, endpoint, data):
+        """记录即将展示的内容."""
+        if ENDPOINTS[endpoint].no_repeat:
+            self.recent.add(endpoint, data)
+
+    async def _async_call_api(self, endpoint, params):
+        """调用API，熔断冷却中、额度不足或请求失败时返回None."""
+        # 检查在任务开始时同步完成，任务按优先级顺序创建即按优先级占用额度
+        # 后台刷新、预取和队列补充等其他请求不能占用保留额度
+        if not self.breakers.try_acquire(endpoint):
+            _LOGGER.debug("熔断器冷却中，跳过请求: %s", endpoint)
+            return None
+        if not self.budget.async_consume(endpoint, self._is_reserved(endpoint)):
+            self.breakers.release(endpoint)
+            _LOGGER.debug("调用额度不足，跳过请求: %s", endpoint)
+            return None
+
+        try:
+            async with self._request_semaphore:
+                data = await self.client.async_fetch(
+                    ENDPOINTS[endpoint].url, params, record_fields(endpoint)
+                )
+        except TianApiRateLimitError:
+            self.breakers.record_rate_limited(endpoint)
+            return None
+        except TianApiQuotaExceededError:
+            self.breakers.release(endpoint)
+            self.budget.async_mark_exhausted()
+            return None
+        except TianApiAuthError:
+            self.breakers.record_key_failure(endpoint)
+            return None
+        except TianApiError:
+            self.breakers.record_endpoint_failure(endpoint)
+            return None
+        except BaseException:
+            self.breakers.release(endpoint)
+            raise
+
+        self.breakers.record_success(endpoint)
+        self._async_ingest(endpoint, data)
+        return data
+
+    @callback
+    def _async_ingest(self, endpoint, data):
+        """已获取的内容全部存入本地语料库和检索索引."""
+        self._async_create_task(self.corpus.async_add(endpoint, data))
+        for item in extract_items(endpoint, data):
+            record = make_record(endpoint, item)
+            self.search_index.add(endpoint, content_hash(record), record.as_dict())
+
+    async def _async_next_batch_item(self, endpoint):
+        """从本地队列取出一条内容，队列不足时批量补充."""
+        item = self.queue.pop(endpoint)
+        if item is None:
+            # 已有补充进行中时等待其完成，避免重复请求
+            refill = self._refills.get(endpoint) or self._async_start_refill(endpoint)
+            await asyncio.shield(refill)
+            item = self.queue.pop(endpoint)
+            if item is None:
+                return None
+        elif self.queue.size(endpoint) < BATCH_LOW_WATER and endpoint not in self._refills:
+            # 低于低水位时在后台补充，本次先使用队列中的内容
+            self._async_start_refill(endpoint)
+
+        _LOGGER.debug("使用队列内容: %s，剩余 %d 条", endpoint, self.queue.size(endpoint))
+        return make_record(endpoint, item)
+
+    @callback
+    def _async_start_refill(self, endpoint):
+        """开始补充队列，同一端点同时只有一个补充任务."""
+        task = self._async_create_task(self._async_refill(endpoint))
+        self._refills[endpoint] = task
+        task.add_done_callback(lambda _task: self._refills.pop(endpoint, None))
+        return task
+
+    async def _async_refill(self, endpoint):
+        """一次请求多条内容补充到队列."""
+        spec = ENDPOINTS[endpoint]
+        params = {**spec.params, spec.batch_param: self.batch_size}
+        data = await self._async_call_api(endpoint, params)
+        if data:
+            self.queue.extend(endpoint, extract_items(endpoint, data))
+
+    @staticmethod
+    def _compile_schedule(slots, endpoints, default_slots):
+        """编译时段表，配置无效时使用内容组合的默认时段表（其中关闭的端点显示为空内容）."""
+        try:
+            return TianSlotSchedule(slots, endpoints)
+        except ValueError as e:
+            _LOGGER.error("滚动内容时段表无效，使用默认时段表: %s", e)
+            return TianSlotSchedule(default_slots)
+
+    @staticmethod
+    def _cache_key(endpoint):
+        """返回端点对应的缓存键."""
+        return make_cache_key(endpoint, ENDPOINTS[endpoint].params)
+
+    def _soft_ttl(self, endpoint):
+        """返回端点的软过期时间，由刷新方式决定.
+
+        自动刷新时，时段表中的端点为时段周期（是否新鲜按预取时间判断，见_is_fresh），
+        其余使用端点声明或选项中的设置；手动刷新的端点返回None，缓存不会过期。
+        """
+        policy = self.policies[endpoint]
+        if policy.mode == POLICY_MANUAL:
+            return None
+        if policy.mode == POLICY_DAILY:
+            return 24 * 3600
+        if policy.mode == POLICY_EVERY:
+            return policy.hours * 3600
+        if self._is_slot_driven(endpoint):
+            return self.schedule.cycle(endpoint) * 60
+        return ENDPOINTS[endpoint].ttl or self.soft_ttl
+
+    def _hard_ttl(self, endpoint):
+        """返回端点的硬过期时间，手动刷新的端点不过期."""
+        soft_ttl = self._soft_ttl(endpoint)
+        if soft_ttl is None:
+            return None
+        return max(self.hard_ttl, soft_ttl)
+
+    def _is_fresh(self, endpoint, age):
+        """检查缓存是否仍在软过期时间内，由时段预取刷新的端点须在最近一次预取之后获取."""
+        if age is None:
+            return False
+        if self._is_slot_driven(endpoint):
+            prefetched = self.schedule.last_start(endpoint, self.prefetch_lead)
+            return age <= dt_util.now().timestamp() - prefetched.timestamp()
+        soft_ttl = self._soft_ttl(endpoint)
+        return soft_ttl is None or age < soft_ttl
+
+    def _is_slot_driven(self, endpoint):
+        """自动刷新且在时段表中的端点由时段预取刷新."""
+        return self.policies[endpoint].mode == POLICY_AUTO and self.schedule.cycle(endpoint) is not None
+
+    def _is_reserved(self, endpoint):
+        """当前时段、下一时段（预取的目标）的端点和优先级最高的端点可以使用保留额度."""
+        if ENDPOINTS[endpoint].priority == 1:
+            return True
+        schedule = self.schedule
+        return endpoint in (schedule.slot_at().endpoint, schedule.slot_at(schedule.next_change()).endpoint)
+
+    def _prioritized_endpoints(self):
+        """返回按优先级排序的端点列表."""
+        current = self.schedule.slot_at().endpoint
+        return sorted(
+            self.endpoints,
+            key=lambda key: 0 if key == current else ENDPOINTS[key].priority,
+        )
+
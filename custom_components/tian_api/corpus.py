@@ -0,0 +1,174 @@
+"""Local content corpus for Tian API integration."""
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .endpoints import extract_items, make_record
+from .records import content_hash
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    endpoint TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    fetched_date TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL,
+    served_at INTEGER NOT NULL DEFAULT 0,
+    content TEXT NOT NULL,
+    PRIMARY KEY (endpoint, hash)
+);
+CREATE INDEX IF NOT EXISTS idx_items_date ON items (fetched_date);
+CREATE INDEX IF NOT EXISTS idx_items_served ON items (endpoint, served_at);
+"""
+
+
+class TianContentCorpus:
+    """保存所有已获取内容的本地SQLite语料库."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize the corpus."""
+        self.hass = hass
+        self.path = hass.config.path(".storage", f"{DOMAIN}.{entry_id}.corpus.db")
+        self._conn = None
+        self._lock = threading.Lock()
+
+    async def async_open(self):
+        """打开数据库."""
+        await self.hass.async_add_executor_job(self._open)
+
+    async def async_close(self):
+        """关闭数据库."""
+        await self.hass.async_add_executor_job(self._close)
+
+    async def async_add(self, endpoint, data):
+        """保存API响应中的所有内容."""
+        records = [make_record(endpoint, item) for item in extract_items(endpoint, data)]
+        if records:
+            await self.hass.async_add_executor_job(self._add, endpoint, records)
+
+    async def async_draw(self, endpoint, exclude=frozenset()):
+        """取出一条最久未展示且哈希不在exclude中的记录，没有时返回None."""
+        item = await self.hass.async_add_executor_job(self._draw, endpoint, exclude)
+        return make_record(endpoint, item) if item is not None else None
+
+    async def async_items(self, endpoints):
+        """返回指定端点的所有 (端点, 哈希, 内容字典)."""
+        return await self.hass.async_add_executor_job(self._items, list(endpoints))
+
+    async def async_stats(self):
+        """返回各端点的内容数量."""
+        return await self.hass.async_add_executor_job(self._stats)
+
+    async def async_remove(self):
+        """删除数据库文件."""
+        await self.hass.async_add_executor_job(self._remove)
+
+    def _open(self):
+        """在线程池中打开数据库."""
+        with self._lock:
+            if self._conn is not None:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.executescript(_SCHEMA)
+            except (OSError, sqlite3.Error) as e:
+                # 语料库不可用时不影响正常获取
+                _LOGGER.error("无法打开本地语料库 %s: %s", self.path, e)
+                self._conn = None
+
+    def _close(self):
+        """在线程池中关闭数据库."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _add(self, endpoint, records):
+        """在线程池中写入内容，已存在的内容忽略."""
+        now = datetime.now()
+        rows = [
+            (
+                endpoint,
+                content_hash(record),
+                now.strftime("%Y-%m-%d"),
+                int(now.timestamp()),
+                json.dumps(record.as_dict(), ensure_ascii=False),
+            )
+            for record in records
+        ]
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO items (endpoint, hash, fetched_date, fetched_at, content) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+            except sqlite3.Error as e:
+                _LOGGER.error("写入本地语料库失败: %s", e)
+
+    def _draw(self, endpoint, exclude):
+        """在线程池中取出最久未展示的内容并记录展示时间."""
+        with self._lock:
+            if self._conn is None:
+                return None
+            try:
+                rows = self._conn.execute(
+                    "SELECT hash, content FROM items WHERE endpoint = ? "
+                    "ORDER BY served_at, RANDOM()",
+                    (endpoint,),
+                )
+                row = next((row for row in rows if row[0] not in exclude), None)
+                if row is None:
+                    return None
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE items SET served_at = ? WHERE endpoint = ? AND hash = ?",
+                        (int(datetime.now().timestamp()), endpoint, row[0]),
+                    )
+            except sqlite3.Error as e:
+                _LOGGER.error("读取本地语料库失败: %s", e)
+                return None
+        return json.loads(row[1])
+
+    def _items(self, endpoints):
+        """在线程池中读取指定端点的所有内容."""
+        with self._lock:
+            if self._conn is None:
+                return []
+            placeholders = ", ".join("?" * len(endpoints))
+            try:
+                rows = self._conn.execute(
+                    f"SELECT endpoint, hash, content FROM items WHERE endpoint IN ({placeholders})",
+                    endpoints,
+                ).fetchall()
+            except sqlite3.Error as e:
+                _LOGGER.error("读取本地语料库失败: %s", e)
+                return []
+        return [(endpoint, digest, json.loads(content)) for endpoint, digest, content in rows]
+
+    def _stats(self):
+        """在线程池中统计各端点内容数量."""
+        with self._lock:
+            if self._conn is None:
+                return {}
+            rows = self._conn.execute(
+                "SELECT endpoint, COUNT(*) FROM items GROUP BY endpoint"
+            ).fetchall()
+        return dict(rows)
+
+    def _remove(self):
+        """在线程池中删除数据库文件."""
+        self._close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
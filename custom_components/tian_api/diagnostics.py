@@ -0,0 +1,27 @@
+"""Diagnostics support for Tian API integration."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_API_KEY
+
+TO_REDACT = {CONF_API_KEY}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "endpoints": sorted((coordinator.data or {}).keys()),
+        "requests": coordinator.request_stats,
+        "cache": coordinator.cache.stats,
+        "queues": coordinator.queue.stats,
+        "recent": coordinator.recent.stats,
+        "corpus": await coordinator.corpus.async_stats(),
+        "search_index": coordinator.search_index.stats,
+        "budget": coordinator.budget.as_dict(),
+        "breakers": coordinator.breakers.as_dict(),
+    }
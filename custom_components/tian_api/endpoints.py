@@ -0,0 +1,135 @@
+"""Endpoint registry for Tian API integration."""
+from collections import namedtuple
+
+from .const import (
+    PROFILE_FULL,
+    PROFILE_CLASSIC,
+    DEFAULT_SCROLLING_SCHEDULE,
+    CLASSIC_SCROLLING_SCHEDULE,
+)
+from .records import (
+    Riddle,
+    Joke,
+    Greeting,
+    Poem,
+    SongCi,
+    YuanQu,
+    History,
+    Sentence,
+    Couplet,
+    Maxim,
+)
+
+# result 的结构
+SHAPE_ITEM = "item"  # result 为单条内容，个别接口以列表返回
+SHAPE_LIST = "list"  # result 为 {"list": [...]}
+
+# 端点声明：
+# url 接口地址，params 额外查询参数，record 记录类型（其字段即请求的字段投影），
+# shape result结构，ttl 软过期时间（None为使用选项中的设置），
+# batch_param 批量获取的数量参数名，no_repeat 是否避免重复展示，
+# priority 配额不足时的请求优先级（数值越小越优先），search_fields 全文检索的字段
+TianEndpoint = namedtuple(
+    "TianEndpoint",
+    ["url", "params", "record", "shape", "ttl", "batch_param", "no_repeat", "priority", "search_fields"],
+)
+
+
+def _endpoint(url, record, params=None, shape=SHAPE_ITEM, ttl=None, batch_param=None,
+              no_repeat=True, priority=9, search_fields=()):
+    """声明一个端点."""
+    return TianEndpoint(url, params or {}, record, shape, ttl, batch_param, no_repeat, priority, search_fields)
+
+
+# 端点注册表：缓存键 -> 端点声明，增删端点只需修改此处
+ENDPOINTS = {
+    "riddle": _endpoint(
+        "https://apis.tianapi.com/caizimi/index", Riddle, priority=4,
+    ),
+    "joke": _endpoint(
+        "https://apis.tianapi.com/joke/index", Joke, params={"num": 1},
+        shape=SHAPE_LIST, batch_param="num", priority=4,
+    ),
+    # 早安、晚安、简说历史按日期返回，不需要避免重复
+    "morning": _endpoint(
+        "https://apis.tianapi.com/zaoan/index", Greeting, no_repeat=False, priority=1,
+    ),
+    "evening": _endpoint(
+        "https://apis.tianapi.com/wanan/index", Greeting, no_repeat=False, priority=1,
+    ),
+    "poetry": _endpoint(
+        "https://apis.tianapi.com/poetry/index", Poem, shape=SHAPE_LIST, priority=2,
+        search_fields=("title", "author", "content"),
+    ),
+    "songci": _endpoint(
+        "https://apis.tianapi.com/zmsc/index", SongCi, priority=2,
+        search_fields=("content", "source"),
+    ),
+    "yuanqu": _endpoint(
+        "https://apis.tianapi.com/yuanqu/index", YuanQu, params={"num": 1, "page": 1},
+        shape=SHAPE_LIST, batch_param="num", priority=2,
+        search_fields=("title", "author", "content"),
+    ),
+    "history": _endpoint(
+        "https://apis.tianapi.com/pitlishi/index", History, no_repeat=False, priority=3,
+    ),
+    "sentence": _endpoint(
+        "https://apis.tianapi.com/gjmj/index", Sentence, priority=3,
+        search_fields=("content", "source"),
+    ),
+    "couplet": _endpoint(
+        "https://apis.tianapi.com/duilian/index", Couplet, priority=3,
+        search_fields=("content",),
+    ),
+    "maxim": _endpoint(
+        "https://apis.tianapi.com/enmaxim/index", Maxim, priority=3,
+    ),
+}
+
+# 支持全文检索的端点
+SEARCH_ENDPOINTS = tuple(key for key, spec in ENDPOINTS.items() if spec.search_fields)
+
+# 内容组合 -> (使用的端点, 默认滚动时段表)
+PROFILES = {
+    PROFILE_FULL: (tuple(ENDPOINTS), DEFAULT_SCROLLING_SCHEDULE),
+    PROFILE_CLASSIC: (
+        tuple(key for key in ENDPOINTS if key not in ("riddle", "joke")),
+        CLASSIC_SCROLLING_SCHEDULE,
+    ),
+}
+
+
+def record_fields(endpoint):
+    """返回端点记录需要的字段."""
+    return ENDPOINTS[endpoint].record.__slots__
+
+
+def make_record(endpoint, item):
+    """由单条内容字典创建端点的记录."""
+    return ENDPOINTS[endpoint].record.from_dict(item)
+
+
+def empty_record(endpoint):
+    """返回端点的空记录."""
+    return ENDPOINTS[endpoint].record()
+
+
+def extract_items(endpoint, data):
+    """从API响应中取出各条内容，列表或字典结构按端点声明确定."""
+    result = (data or {}).get("result")
+    if ENDPOINTS[endpoint].shape == SHAPE_LIST:
+        result = result.get("list") if isinstance(result, dict) else None
+        return [item for item in result or () if isinstance(item, dict)]
+    if isinstance(result, list):
+        return [item for item in result if isinstance(item, dict)]
+    if isinstance(result, dict) and result:
+        return [result]
+    return []
+
+
+def normalize(endpoint, data):
+    """将API响应转换为首条内容的记录，没有内容时返回None."""
+    items = extract_items(endpoint, data)
+    if not items:
+        return None
+    return make_record(endpoint, items[0])
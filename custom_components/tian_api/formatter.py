@@ -0,0 +1,40 @@
+"""Text formatting for Tian API integration."""
+from functools import lru_cache
+
+HTML_BREAK = "<br>"
+PLAIN_BREAK = "\n"
+
+# 在这些中文标点后换行
+_BREAK_AFTER = frozenset("。？！")
+
+
+@lru_cache(maxsize=256)
+def _format(text):
+    """一次扫描同时生成HTML和纯文本两种换行格式."""
+    html = []
+    plain = []
+    pending = False
+    for index, char in enumerate(text):
+        if pending:
+            # 原文已换行时不再重复添加
+            if not text.startswith(HTML_BREAK, index):
+                html.append(HTML_BREAK)
+            if char != PLAIN_BREAK:
+                plain.append(PLAIN_BREAK)
+            pending = False
+        html.append(char)
+        plain.append(char)
+        pending = char in _BREAK_AFTER
+
+    # 去掉文本末尾的换行（按整个换行标记去除，而不是逐个字符）
+    html_text = "".join(html)
+    while html_text.endswith(HTML_BREAK):
+        html_text = html_text[:-len(HTML_BREAK)]
+    return html_text, "".join(plain).rstrip(PLAIN_BREAK)
+
+
+def format_breaks(text):
+    """返回 (使用<br>换行的文本, 使用\\n换行的文本)，相同文本只格式化一次."""
+    if text is None:
+        return "", ""
+    return _format(str(text))
@@ -0,0 +1,121 @@
+"""Per-endpoint refresh policies for Tian API integration."""
+import logging
+from collections import namedtuple
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change, async_track_time_interval
+
+from .const import (
+    POLICY_OFF,
+    POLICY_AUTO,
+    POLICY_DAILY,
+    POLICY_EVERY,
+    POLICY_MANUAL,
+)
+from .endpoints import ENDPOINTS, PROFILES
+
+_LOGGER = logging.getLogger(__name__)
+
+# mode 刷新方式，at 每天刷新的 (时, 分)，hours 刷新间隔小时数
+RefreshPolicy = namedtuple("RefreshPolicy", ["mode", "at", "hours"], defaults=(None, None))
+
+
+def parse_policy(text):
+    """解析 "off"、"auto"、"manual"、"daily HH:MM" 或 "every N" 格式的刷新方式."""
+    parts = text.strip().lower().split()
+    if len(parts) == 1 and parts[0] in (POLICY_OFF, POLICY_AUTO, POLICY_MANUAL):
+        return RefreshPolicy(parts[0])
+    if len(parts) == 2 and parts[0] == POLICY_DAILY:
+        try:
+            hour, minute = (int(part) for part in parts[1].split(":"))
+        except ValueError as err:
+            raise ValueError(f"时间格式错误: {parts[1]}") from err
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            raise ValueError(f"时间超出范围: {parts[1]}")
+        return RefreshPolicy(POLICY_DAILY, at=(hour, minute))
+    if len(parts) == 2 and parts[0] == POLICY_EVERY:
+        if not parts[1].isdigit() or not 1 <= int(parts[1]) <= 24 * 7:
+            raise ValueError(f"间隔小时数应为1到168: {parts[1]}")
+        return RefreshPolicy(POLICY_EVERY, hours=int(parts[1]))
+    raise ValueError(f"无法解析: {text}")
+
+
+def format_policy(policy):
+    """将刷新方式转换为文本."""
+    if policy.mode == POLICY_DAILY:
+        return f"{POLICY_DAILY} {policy.at[0]:02d}:{policy.at[1]:02d}"
+    if policy.mode == POLICY_EVERY:
+        return f"{POLICY_EVERY} {policy.hours}"
+    return policy.mode
+
+
+def default_policy_text(profile, endpoint):
+    """返回内容组合中端点的默认刷新方式."""
+    return POLICY_AUTO if endpoint in PROFILES[profile][0] else POLICY_OFF
+
+
+def resolve_policies(profile, stored):
+    """返回所有端点的刷新方式，未设置或无效时使用内容组合的默认值."""
+    policies = {}
+    for endpoint in ENDPOINTS:
+        default = default_policy_text(profile, endpoint)
+        try:
+            policies[endpoint] = parse_policy(stored.get(endpoint, default))
+        except ValueError as e:
+            _LOGGER.error("端点 %s 的刷新方式无效，使用默认值: %s", endpoint, e)
+            policies[endpoint] = parse_policy(default)
+    return policies
+
+
+class TianRefreshScheduler:
+    """按各端点的刷新方式定时刷新，"每天"和"每隔N小时"的端点在此安排."""
+
+    def __init__(self, hass: HomeAssistant, coordinator):
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._unsubs = []
+
+    @callback
+    def async_start(self):
+        """注册定时刷新."""
+        for endpoint, policy in self.coordinator.policies.items():
+            if policy.mode == POLICY_DAILY:
+                self._unsubs.append(
+                    async_track_time_change(
+                        self.hass,
+                        self._make_callback(endpoint),
+                        hour=policy.at[0],
+                        minute=policy.at[1],
+                        second=0,
+                    )
+                )
+            elif policy.mode == POLICY_EVERY:
+                self._unsubs.append(
+                    async_track_time_interval(
+                        self.hass,
+                        self._make_callback(endpoint),
+                        timedelta(hours=policy.hours),
+                    )
+                )
+            else:
+                continue
+            _LOGGER.debug("已安排定时刷新 %s: %s", endpoint, format_policy(policy))
+
+    @callback
+    def async_stop(self):
+        """取消所有定时刷新."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+
+    def _make_callback(self, endpoint):
+        """生成指定端点的刷新回调."""
+
+        @callback
+        def _refresh(_now):
+            _LOGGER.debug("定时刷新: %s", endpoint)
+            self.hass.async_create_task(self.coordinator.async_refresh_endpoint(endpoint, force=True))
+
+        return _refresh
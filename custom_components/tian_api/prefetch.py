@@ -0,0 +1,54 @@
+"""Time-slot prefetch for Tian API integration."""
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TianPrefetchScheduler:
+    """在每个滚动时段开始前提前获取该时段的数据来源端点."""
+
+    def __init__(self, hass: HomeAssistant, coordinator, lead_minutes: int):
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.lead_minutes = lead_minutes
+        self._unsubs = []
+
+    @callback
+    def async_start(self):
+        """按时段表注册预取时间点."""
+        for slot in self.coordinator.schedule.slots:
+            endpoint = slot.endpoint
+            if endpoint not in self.coordinator.endpoints:
+                continue
+            minutes = (slot.start - self.lead_minutes) % (24 * 60)
+            self._unsubs.append(
+                async_track_time_change(
+                    self.hass,
+                    self._make_callback(endpoint),
+                    hour=minutes // 60,
+                    minute=minutes % 60,
+                    second=0,
+                )
+            )
+            _LOGGER.debug("已安排预取 %s: %02d:%02d", endpoint, minutes // 60, minutes % 60)
+
+    @callback
+    def async_stop(self):
+        """取消所有预取."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+
+    def _make_callback(self, endpoint):
+        """生成指定端点的预取回调."""
+
+        @callback
+        def _prefetch(_now):
+            _LOGGER.debug("预取时段数据: %s", endpoint)
+            self.hass.async_create_task(self.coordinator.async_refresh_endpoint(endpoint))
+
+        return _prefetch
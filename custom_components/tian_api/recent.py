@@ -0,0 +1,118 @@
+"""Recently shown content index for Tian API integration."""
+import logging
+import time
+from collections import deque
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, RECENT_STORAGE_VERSION, RECENT_SAVE_DELAY
+from .records import content_hash
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TianRecentContent:
+    """按端点记录近期已展示内容，窗口期内的重复内容会被拒绝."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, window_days: int):
+        """Initialize the index."""
+        self._store = Store(hass, RECENT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.recent")
+        self.window = window_days * 24 * 3600
+        # 哈希 -> 最近展示时间，用于O(1)查找
+        self._seen = {}
+        # 按展示时间排序的 (时间, 哈希) 环形队列，用于淘汰过期记录
+        self._rings = {}
+        self.rejected = 0
+
+    async def async_load(self):
+        """从磁盘加载近期记录."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        for endpoint, entries in stored.get("endpoints", {}).items():
+            for timestamp, digest in entries:
+                self._record(endpoint, digest, timestamp)
+            self._expire(endpoint, time.time())
+
+    def is_repeat(self, endpoint, record):
+        """检查内容是否在窗口期内已展示过."""
+        if not self.window or not record:
+            return False
+
+        digest = content_hash(record)
+        self._expire(endpoint, time.time())
+        if digest in self._seen.get(endpoint, {}):
+            self.rejected += 1
+            return True
+        return False
+
+    def hashes(self, endpoint):
+        """返回端点窗口期内已展示内容的哈希集合."""
+        self._expire(endpoint, time.time())
+        return frozenset(self._seen.get(endpoint, ()))
+
+    @callback
+    def add(self, endpoint, record):
+        """记录一条已展示的内容."""
+        if not self.window or not record:
+            return
+
+        digest = content_hash(record)
+        now = time.time()
+        self._record(endpoint, digest, int(now))
+        self._expire(endpoint, now)
+        self._store.async_delay_save(self._data_to_save, RECENT_SAVE_DELAY)
+
+    @property
+    def stats(self):
+        """返回各端点记录数和被拒绝的重复次数."""
+        return {
+            "window_days": self.window // (24 * 3600),
+            "entries": {endpoint: len(seen) for endpoint, seen in self._seen.items()},
+            "rejected": self.rejected,
+        }
+
+    async def async_flush(self):
+        """立即保存记录到磁盘."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self):
+        """删除磁盘上的记录文件."""
+        self._seen = {}
+        self._rings = {}
+        await self._store.async_remove()
+
+    def _record(self, endpoint, digest, timestamp):
+        """写入一条记录，重复展示的内容以最新时间为准."""
+        self._seen.setdefault(endpoint, {})[digest] = timestamp
+        self._rings.setdefault(endpoint, deque()).append((timestamp, digest))
+
+    def _expire(self, endpoint, now):
+        """从环形队列头部淘汰超出窗口期的记录."""
+        ring = self._rings.get(endpoint)
+        if not ring:
+            return
+
+        seen = self._seen[endpoint]
+        cutoff = now - self.window
+        while ring and ring[0][0] <= cutoff:
+            timestamp, digest = ring.popleft()
+            # 内容后来再次展示过时保留
+            if seen.get(digest) == timestamp:
+                del seen[digest]
+
+    @callback
+    def _data_to_save(self):
+        """返回需要保存的数据."""
+        return {
+            "endpoints": {
+                endpoint: [
+                    [timestamp, digest]
+                    for timestamp, digest in ring
+                    if self._seen[endpoint].get(digest) == timestamp
+                ]
+                for endpoint, ring in self._rings.items()
+            },
+        }
@@ -0,0 +1,102 @@
+"""Normalized content records for Tian API integration."""
+import hashlib
+import json
+
+
+class TianRecord:
+    """单条内容记录，字段缺失时为空字符串."""
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        """Initialize the record."""
+        for name in self.__slots__:
+            value = fields.get(name)
+            setattr(self, name, "" if value is None else str(value))
+
+    @classmethod
+    def from_dict(cls, item):
+        """由API返回的单条内容创建记录，多余字段丢弃."""
+        return cls(**{name: item.get(name) for name in cls.__slots__})
+
+    def as_dict(self):
+        """返回可序列化的字段字典."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __bool__(self):
+        """至少有一个字段有内容时为真."""
+        return any(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        """字段完全相同的记录相等."""
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        """Return the representation."""
+        return f"{type(self).__name__}({self.as_dict()})"
+
+
+class Riddle(TianRecord):
+    """谜语."""
+
+    __slots__ = ("riddle", "type", "answer", "description", "disturb")
+
+
+class Joke(TianRecord):
+    """笑话."""
+
+    __slots__ = ("title", "content")
+
+
+class Greeting(TianRecord):
+    """早安、晚安心语."""
+
+    __slots__ = ("content",)
+
+
+class Poem(TianRecord):
+    """唐诗."""
+
+    __slots__ = ("title", "author", "content", "intro", "kind")
+
+
+class SongCi(TianRecord):
+    """宋词."""
+
+    __slots__ = ("content", "source", "author")
+
+
+class YuanQu(TianRecord):
+    """元曲."""
+
+    __slots__ = ("title", "author", "content", "note", "translation")
+
+
+class History(TianRecord):
+    """简说历史."""
+
+    __slots__ = ("title", "content")
+
+
+class Sentence(TianRecord):
+    """古籍名句."""
+
+    __slots__ = ("content", "source")
+
+
+class Couplet(TianRecord):
+    """对联."""
+
+    __slots__ = ("content",)
+
+
+class Maxim(TianRecord):
+    """英文格言."""
+
+    __slots__ = ("en", "zh")
+
+
+def content_hash(record):
+    """计算记录内容的哈希."""
+    raw = json.dumps(record.as_dict(), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
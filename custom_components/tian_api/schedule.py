@@ -0,0 +1,145 @@
+"""Scrolling content schedule for Tian API integration."""
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .endpoints import ENDPOINTS
+
+MINUTES_PER_DAY = 24 * 60
+
+ScheduleSlot = namedtuple("ScheduleSlot", ["start", "end", "endpoint"])
+
+
+def _parse_time(value):
+    """将 HH:MM 转换为当天分钟数."""
+    try:
+        hour, minute = (int(part) for part in value.split(":"))
+    except ValueError as err:
+        raise ValueError(f"时间格式错误: {value}") from err
+    if not (0 <= hour <= 24 and 0 <= minute < 60) or hour * 60 + minute > MINUTES_PER_DAY:
+        raise ValueError(f"时间超出范围: {value}")
+    return (hour * 60 + minute) % MINUTES_PER_DAY
+
+
+def _format_time(minutes):
+    """将当天分钟数转换为 HH:MM."""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def parse_schedule_text(text):
+    """解析每行一个 "HH:MM-HH:MM 端点" 的时段表文本."""
+    slots = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            span, endpoint = line.split()
+            start, end = span.split("-")
+        except ValueError as err:
+            raise ValueError(f"无法解析: {line}") from err
+        slots.append([start, end, endpoint])
+    return slots
+
+
+def format_schedule_text(slots):
+    """将时段表转换为每行一个时段的文本."""
+    return "\n".join(f"{start}-{end} {endpoint}" for start, end, endpoint in slots)
+
+
+class TianSlotSchedule:
+    """编译后的滚动内容时段表，按开始时间二分查找当前时段.
+
+    时间按Home Assistant配置的时区计算，与预取使用的定时器一致。
+    """
+
+    def __init__(self, slots, endpoints=ENDPOINTS):
+        """编译并校验时段表，时段之间有空档或重叠、或使用了endpoints以外的端点时抛出ValueError."""
+        compiled = []
+        for start, end, endpoint in slots:
+            if endpoint not in ENDPOINTS:
+                raise ValueError(f"未知端点: {endpoint}")
+            if endpoint not in endpoints:
+                raise ValueError(f"端点未启用: {endpoint}")
+            start, end = _parse_time(start), _parse_time(end)
+            # 只有一个时段时开始等于结束表示全天，如 00:00-24:00
+            if start == end and len(slots) > 1:
+                raise ValueError(f"时段长度为零: {_format_time(start)}")
+            compiled.append(ScheduleSlot(start, end, endpoint))
+
+        if not compiled:
+            raise ValueError("时段表为空")
+
+        compiled.sort()
+        # 每个时段的结束时间必须等于下一个时段的开始时间，最后一个时段接回第一个
+        covered = 0
+        for slot, following in zip(compiled, compiled[1:] + compiled[:1]):
+            if slot.end != following.start:
+                kind = "重叠" if _contains(slot, following.start) else "空档"
+                raise ValueError(f"{_format_time(slot.end)} 与 {_format_time(following.start)} 之间存在{kind}")
+            covered += (slot.end - slot.start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+        if covered != MINUTES_PER_DAY:
+            raise ValueError("时段总长不等于一天")
+
+        self.slots = compiled
+        self._starts = [slot.start for slot in compiled]
+        # 端点 -> 相邻两次时段开始的最短间隔（分钟），只出现一次时为一天
+        self._cycles = {}
+        for endpoint in self.endpoints:
+            starts = [slot.start for slot in compiled if slot.endpoint == endpoint]
+            self._cycles[endpoint] = min(
+                (following - start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+                for start, following in zip(starts, starts[1:] + starts[:1])
+            )
+
+    def slot_at(self, now=None):
+        """返回指定时间所在的时段."""
+        if now is None:
+            now = dt_util.now()
+        # 第一个时段之前属于前一天最后一个时段
+        index = bisect_right(self._starts, now.hour * 60 + now.minute) - 1
+        return self.slots[index]
+
+    def next_change(self, now=None):
+        """返回下一个时段的开始时间."""
+        if now is None:
+            now = dt_util.now()
+        index = bisect_right(self._starts, now.hour * 60 + now.minute)
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        # 最后一个时段之后切换到次日第一个时段
+        if index == len(self._starts):
+            return midnight + timedelta(days=1, minutes=self._starts[0])
+        return midnight + timedelta(minutes=self._starts[index])
+
+    def last_start(self, endpoint, lead=0, now=None):
+        """返回端点所在时段最近一次开始（提前lead分钟）的时间，不在时段表中时返回None."""
+        if now is None:
+            now = dt_util.now()
+        minute = now.hour * 60 + now.minute
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        latest = None
+        for slot in self.slots:
+            if slot.endpoint != endpoint:
+                continue
+            start = (slot.start - lead) % MINUTES_PER_DAY
+            # 今天还未到的开始时间属于前一天
+            moment = midnight + timedelta(days=0 if start <= minute else -1, minutes=start)
+            if latest is None or moment > latest:
+                latest = moment
+        return latest
+
+    def cycle(self, endpoint):
+        """返回端点的时段周期（分钟），不在时段表中时返回None."""
+        return self._cycles.get(endpoint)
+
+    @property
+    def endpoints(self):
+        """返回时段表用到的端点."""
+        return {slot.endpoint for slot in self.slots}
+
+
+def _contains(slot, minute):
+    """检查时间点是否落在时段内（含跨零点的时段）."""
+    return (minute - slot.start) % MINUTES_PER_DAY < (slot.end - slot.start) % MINUTES_PER_DAY
@@ -0,0 +1,115 @@
+"""Full-text search index for Tian API integration."""
+import logging
+import math
+import re
+from collections import Counter
+
+from .endpoints import ENDPOINTS
+
+_LOGGER = logging.getLogger(__name__)
+
+_CJK_RUN = re.compile(r"[㐀-䶿一-鿿豈-﫿]+")
+_WORD = re.compile(r"[0-9a-z]+")
+
+
+def document_text(endpoint, item):
+    """拼接内容中可检索的字段."""
+    return "\n".join(
+        str(item[field]) for field in ENDPOINTS[endpoint].search_fields if item.get(field)
+    ).lower()
+
+
+def tokenize(text):
+    """将文本切分为汉字单字、相邻二字组和英文单词."""
+    tokens = []
+    for run in _CJK_RUN.findall(text):
+        tokens.extend(run)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    tokens.extend(_WORD.findall(text))
+    return tokens
+
+
+def _query_tokens(term):
+    """查询词只使用二字组，单个汉字时使用单字."""
+    tokens = []
+    for run in _CJK_RUN.findall(term):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    tokens.extend(_WORD.findall(term))
+    return tokens
+
+
+class TianSearchIndex:
+    """诗词、名句、对联内容的二字组倒排索引."""
+
+    def __init__(self):
+        """Initialize the index."""
+        # 词 -> {文档ID: 词频}
+        self._postings = {}
+        # 文档ID -> (端点, 内容, 检索文本, 词数)
+        self._docs = {}
+
+    def __len__(self):
+        """返回已索引的文档数."""
+        return len(self._docs)
+
+    def add(self, endpoint, doc_id, item):
+        """索引一条内容，已索引的内容忽略."""
+        if endpoint not in ENDPOINTS or not ENDPOINTS[endpoint].search_fields or doc_id in self._docs:
+            return
+
+        text = document_text(endpoint, item)
+        tokens = tokenize(text)
+        if not tokens:
+            return
+
+        self._docs[doc_id] = (endpoint, item, text, len(tokens))
+        for token, count in Counter(tokens).items():
+            self._postings.setdefault(token, {})[doc_id] = count
+
+    def add_many(self, rows):
+        """批量索引 (端点, 文档ID, 内容) 列表."""
+        for endpoint, doc_id, item in rows:
+            self.add(endpoint, doc_id, item)
+
+    def search(self, query, endpoints=None, limit=10):
+        """返回同时包含所有查询词的内容，按TF-IDF得分排序."""
+        terms = [term for term in query.lower().split() if _query_tokens(term)]
+        if not terms:
+            return []
+
+        tokens = {token for term in terms for token in _query_tokens(term)}
+        postings = [self._postings.get(token) for token in tokens]
+        if not all(postings):
+            return []
+
+        # 从最短的倒排表开始求交集
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+
+        total = len(self._docs)
+        idf = {token: math.log(1 + total / len(self._postings[token])) for token in tokens}
+        results = []
+        for doc_id in candidates:
+            endpoint, item, text, length = self._docs[doc_id]
+            if endpoints and endpoint not in endpoints:
+                continue
+            # 二字组都出现不代表整个词连续出现，需再确认
+            if not all(term in text for term in terms):
+                continue
+            score = sum(self._postings[token][doc_id] * idf[token] for token in tokens)
+            results.append((score / math.sqrt(length), endpoint, item))
+
+        results.sort(key=lambda result: result[0], reverse=True)
+        return results[:limit]
+
+    @property
+    def stats(self):
+        """返回索引规模."""
+        return {"documents": len(self._docs), "terms": len(self._postings)}
@@ -1,41 +1,54 @@
 """Sensor platform for Tian API integration."""
+import json
 import logging
-import asyncio
-import aiohttp
-import async_timeout
-from datetime import timedelta
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
     DEVICE_NAME,
     DEVICE_MANUFACTURER,
     DEVICE_MODEL,
-    RIDDLE_API_URL,
-    JOKE_API_URL,
-    MORNING_API_URL,
-    EVENING_API_URL,
-    POETRY_API_URL,
-    SONG_CI_API_URL,
-    YUAN_QU_API_URL,
-    HISTORY_API_URL,
-    SENTENCE_API_URL,
-    COUPLET_API_URL,
-    MAXIM_API_URL,
-    CONF_API_KEY,
+    CONF_ITEM_SENSORS,
+    DEFAULT_ITEM_SENSORS,
+    ITEM_ATTRIBUTES_MAX_BYTES,
+    STATE_MAX_LENGTH,
+    CONF_UPDATE_MODE,
+    DEFAULT_UPDATE_MODE,
+    UPDATE_MODE_ON_CHANGE,
 )
+from .coordinator import TianDataUpdateCoordinator
+from .formatter import format_breaks
+from .endpoints import empty_record
 
 _LOGGER = logging.getLogger(__name__)
-SCAN_INTERVAL = timedelta(hours=24)  # 每天更新一次
 
-# 全局缓存，避免重复调用API
-_data_cache = {}
-_cache_timestamp = {}
+# 每次更新都会变化、不属于内容本身的属性，不参与内容比较
+VOLATILE_ATTRIBUTES = frozenset({"update_time", "fetched_at", "data_age", "stale"})
+
+# 单项内容传感器：端点 -> (名称, 图标, 作为状态的字段, 该字段为空时的状态)
+ITEM_SENSORS = {
+    "poetry": ("唐诗鉴赏", "mdi:book-open-variant", "title", "无题"),
+    "songci": ("最美宋词", "mdi:book-open-variant", "source", "宋词"),
+    "yuanqu": ("精选元曲", "mdi:book-open-variant", "title", "无题"),
+    "history": ("简说历史", "mdi:history", "content", "暂无历史内容"),
+    "sentence": ("古籍名句", "mdi:format-quote-open", "content", "暂无名句内容"),
+    "couplet": ("经典对联", "mdi:format-quote-open", "content", "暂无对联内容"),
+    "maxim": ("英文格言", "mdi:comment-quote", "zh", "暂无格言"),
+    "riddle": ("每日谜语", "mdi:help-circle-outline", "riddle", "暂无谜语"),
+    "joke": ("每日笑话", "mdi:emoticon-happy-outline", "title", "今日笑话"),
+    "morning": ("早安心语", "mdi:weather-sunset-up", "content", "早安！新的一天开始了！"),
+    "evening": ("晚安心语", "mdi:weather-night", "content", "晚安！好梦！"),
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -43,8 +56,8 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
-    api_key = config_entry.data[CONF_API_KEY]
-    
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
     # 创建设备信息
     device_info = DeviceInfo(
         identifiers={(DOMAIN, "tian_info_query")},
@@ -53,36 +66,61 @@ async def async_setup_entry(
         model=DEVICE_MODEL,
         configuration_url="https://www.tianapi.com/",
     )
-    
-    # 创建五个传感器实体
+
+    # 创建传感器实体，数据统一由协调器获取
     sensors = [
-        TianRiddleJokeSensor(api_key, device_info, config_entry.entry_id),
-        TianMorningEveningSensor(api_key, device_info, config_entry.entry_id),
-        TianPoetrySensor(api_key, device_info, config_entry.entry_id),
-        TianDailyWordsSensor(api_key, device_info, config_entry.entry_id),
-        TianScrollingContentSensor(api_key, device_info, config_entry.entry_id),
+        TianRiddleJokeSensor(coordinator, device_info, config_entry.entry_id),
+        TianMorningEveningSensor(coordinator, device_info, config_entry.entry_id),
+        TianPoetrySensor(coordinator, device_info, config_entry.entry_id),
+        TianDailyWordsSensor(coordinator, device_info, config_entry.entry_id),
+        TianScrollingContentSensor(coordinator, device_info, config_entry.entry_id),
+        TianQuotaSensor(coordinator, device_info, config_entry.entry_id),
     ]
-    
-    # 设置 update_before_add=True 确保首次添加时立即更新数据
-    async_add_entities(sensors, update_before_add=True)
-    
+
+    # 可选：每项内容单独一个轻量传感器
+    if config_entry.options.get(CONF_ITEM_SENSORS, DEFAULT_ITEM_SENSORS):
+        sensors.extend(
+            TianContentItemSensor(coordinator, device_info, config_entry.entry_id, endpoint)
+            for endpoint in ITEM_SENSORS
+        )
+
+    # 只创建所用端点都在内容组合中的传感器
+    enabled = set(coordinator.endpoints)
+    sensors = [sensor for sensor in sensors if enabled.issuperset(sensor._endpoints)]
+
+    # 移除之前创建、当前选项下不再使用的传感器
+    registry = er.async_get(hass)
+    unique_ids = {sensor.unique_id for sensor in sensors}
+    for registry_entry in er.async_entries_for_config_entry(registry, config_entry.entry_id):
+        if registry_entry.domain == "sensor" and registry_entry.unique_id not in unique_ids:
+            registry.async_remove(registry_entry.entity_id)
+
+    async_add_entities(sensors)
+
     # 记录集成加载成功
-    _LOGGER.info("天聚数行集成 v1.1.0 加载成功，实体已创建并开始首次更新")
+    _LOGGER.info("天聚数行集成加载成功，实体已创建")
 
 
-class TianRiddleJokeSensor(SensorEntity):
-    """天聚数行谜语笑话传感器."""
+class TianBaseSensor(CoordinatorEntity, SensorEntity):
+    """天聚数行传感器基类，数据由协调器统一获取."""
 
-    def __init__(self, api_key: str, device_info: DeviceInfo, entry_id: str):
+    # 传感器使用的端点
+    _endpoints = ()
+    # 数据获取时间每次都会变化，不写入历史记录
+    _unrecorded_attributes = frozenset({"fetched_at", "data_age", "stale"})
+
+    def __init__(self, coordinator: TianDataUpdateCoordinator, device_info: DeviceInfo):
         """Initialize the sensor."""
-        self._api_key = api_key
-        self._attr_name = "谜语笑话"
-        self._attr_unique_id = f"{entry_id}_riddle_joke"
+        super().__init__(coordinator)
         self._attr_device_info = device_info
-        self._attr_icon = "mdi:newspaper-variant"
         self._state = "等待更新"
         self._attributes = {}
         self._available = True
+        # 内容未变化时不写入状态
+        self._write_on_change = (
+            coordinator.entry.options.get(CONF_UPDATE_MODE, DEFAULT_UPDATE_MODE) == UPDATE_MODE_ON_CHANGE
+        )
+        self._fingerprint = None
 
     @property
     def state(self):
@@ -99,1009 +137,696 @@ class TianRiddleJokeSensor(SensorEntity):
         """Return True if entity is available."""
         return self._available
 
-    async def async_update(self):
-        """Update sensor data."""
+    async def async_added_to_hass(self):
+        """Run when entity about to be added to hass."""
+        await super().async_added_to_hass()
+        self.coordinator.entities[self.entity_id] = self
+        self.async_on_remove(lambda: self.coordinator.entities.pop(self.entity_id, None))
+        self._update_from_coordinator()
+        self._fingerprint = self._content_fingerprint()
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Handle updated data from the coordinator."""
+        previous = (self._state, self._attributes)
+        self._update_from_coordinator()
+        if self._write_on_change and self._content_fingerprint() == self._fingerprint:
+            # 内容未变化，保留上次写入的状态和更新时间
+            self._state, self._attributes = previous
+            return
+        self._async_write_state()
+
+    @callback
+    def _async_write_state(self):
+        """写入状态并记录内容指纹."""
+        self._fingerprint = self._content_fingerprint()
+        self.async_write_ha_state()
+
+    def _content_fingerprint(self):
+        """计算不含时间类属性的内容指纹."""
+        attributes = {
+            key: value
+            for key, value in (self.extra_state_attributes or {}).items()
+            if key not in VOLATILE_ATTRIBUTES
+        }
+        return hash((
+            self.available,
+            json.dumps(attributes, ensure_ascii=False, sort_keys=True, default=str),
+        ))
+
+    def _update_from_coordinator(self):
+        """根据协调器数据更新传感器."""
         try:
-            # 获取谜语数据
-            riddle_data = await self._fetch_cached_data("riddle", self._fetch_riddle_data)
-            # 获取笑话数据
-            joke_data = await self._fetch_cached_data("joke", self._fetch_joke_data)
-            
-            if riddle_data and joke_data:
-                # 处理数据
-                riddle_result = riddle_data.get("result", {})
-                joke_list = joke_data.get("result", {}).get("list", [])
-                
-                if joke_list:
-                    joke_result = joke_list[0]
-                else:
-                    joke_result = {}
-                
-                # 设置状态为更新时间
-                current_time = self._get_current_time()
-                self._state = current_time
-                self._available = True
-                
-                # 设置属性
-                self._attributes = {
-                    "title": "谜语笑话",
-                    "code": joke_data.get("code", 0),
-                    "riddle": {
-                        "subtitle": "每日谜语",
-                        "content": riddle_result.get("riddle", ""),
-                        "type": riddle_result.get("type", ""),
-                        "answer": riddle_result.get("answer", ""),
-                        "description": riddle_result.get("description", ""),
-                        "disturb": riddle_result.get("disturb", "")
-                    },
-                    "joke": {
-                        "subtitle": "每日笑话",
-                        "name": joke_result.get("title", ""),
-                        "content": joke_result.get("content", "")
-                    },
-                    "update_time": current_time
-                }
-                
-                _LOGGER.info("天聚数行谜语笑话更新成功")
-                
-            else:
-                self._available = False
-                self._state = "API请求失败"
-                _LOGGER.error("无法获取天聚数行谜语笑话，请检查API密钥是否正确")
-                
+            self._update_from_data(self.coordinator.data or {})
+            # 附加数据新鲜度，显示内容距上次获取有多久
+            if self._available:
+                freshness = self.coordinator.data_freshness(self._data_endpoints())
+                if freshness:
+                    self._attributes.update(freshness)
         except Exception as e:
-            _LOGGER.error("更新天聚数行谜语笑话传感器时出错: %s", e)
+            _LOGGER.error("更新天聚数行%s传感器时出错: %s", self._attr_name, e)
             self._available = False
             self._state = f"更新失败: {str(e)}"
 
-    async def _fetch_riddle_data(self):
-        """获取谜语数据."""
-        url = f"{RIDDLE_API_URL}?key={self._api_key}"
-        return await self._fetch_api_data(url)
-
-    async def _fetch_joke_data(self):
-        """获取笑话数据."""
-        url = f"{JOKE_API_URL}?key={self._api_key}&num=1"
-        return await self._fetch_api_data(url)
-
-    async def _fetch_cached_data(self, cache_key, fetch_func):
-        """获取缓存数据，避免重复调用API."""
-        global _data_cache, _cache_timestamp
-        
-        # 检查缓存是否有效（1小时内）
-        current_time = self._get_current_timestamp()
-        if (cache_key in _data_cache and 
-            cache_key in _cache_timestamp and 
-            current_time - _cache_timestamp[cache_key] < 3600):  # 1小时缓存
-            _LOGGER.debug("使用缓存数据: %s", cache_key)
-            return _data_cache[cache_key]
-        
-        # 调用API获取新数据
-        data = await fetch_func()
-        if data and data.get("code") == 200:  # 确保数据有效
-            _data_cache[cache_key] = data
-            _cache_timestamp[cache_key] = current_time
-            _LOGGER.info("已更新缓存数据: %s", cache_key)
-        return data
-
-    async def _fetch_api_data(self, url: str):
-        """获取API数据."""
-        session = async_get_clientsession(self.hass)
-        
-        try:
-            async with async_timeout.timeout(15):
-                response = await session.get(url)
-                if response.status == 200:
-                    data = await response.json()
-                    _LOGGER.debug("API响应: %s", data)
-                    
-                    # 检查API返回的错误码
-                    if data.get("code") == 200:
-                        return data
-                    elif data.get("code") == 130:  # 频率限制
-                        _LOGGER.warning("API调用频率超限，请稍后再试")
-                        return None
-                    elif data.get("code") == 100:  # 常见错误码
-                        _LOGGER.error("API密钥错误: %s", data.get("msg", "未知错误"))
-                    else:
-                        _LOGGER.error("API返回错误[%s]: %s", data.get("code"), data.get("msg", "未知错误"))
-                else:
-                    _LOGGER.error("HTTP请求失败: %s", response.status)
-        except asyncio.TimeoutError:
-            _LOGGER.error("API请求超时")
-        except Exception as e:
-            _LOGGER.error("获取API数据时出错: %s", e)
-        
-        return None
+    def _update_from_data(self, data):
+        """根据各端点数据更新状态和属性."""
+        raise NotImplementedError
+
+    @property
+    def content_endpoints(self):
+        """返回当前显示内容所使用的端点."""
+        return self._data_endpoints()
+
+    def _data_endpoints(self):
+        """返回当前显示内容所使用的端点."""
+        return self._endpoints
 
     def _get_current_time(self):
         """获取当前时间字符串."""
-        from datetime import datetime
-        now = datetime.now()
+        now = dt_util.now()
         return now.strftime("%Y-%m-%d %H:%M:%S")
-    
-    def _get_current_timestamp(self):
-        """获取当前时间戳."""
-        from datetime import datetime
-        return int(datetime.now().timestamp())
 
 
-class TianMorningEveningSensor(SensorEntity):
+class TianRiddleJokeSensor(TianBaseSensor):
+    """天聚数行谜语笑话传感器."""
+
+    _endpoints = ("riddle", "joke")
+
+    def __init__(self, coordinator: TianDataUpdateCoordinator, device_info: DeviceInfo, entry_id: str):
+        """Initialize the sensor."""
+        super().__init__(coordinator, device_info)
+        self._attr_name = "谜语笑话"
+        self._attr_unique_id = f"{entry_id}_riddle_joke"
+        self._attr_icon = "mdi:newspaper-variant"
+
+    def _update_from_data(self, data):
+        """根据各端点数据更新状态和属性."""
+        # 获取谜语数据
+        riddle = data.get("riddle")
+        # 获取笑话数据
+        joke = data.get("joke")
+
+        if riddle and joke:
+            # 设置状态为更新时间
+            current_time = self._get_current_time()
+            self._state = current_time
+            self._available = True
+
+            # 设置属性
+            self._attributes = {
+                "title": "谜语笑话",
+                "code": 200,
+                "riddle": {
+                    "subtitle": "每日谜语",
+                    "content": riddle.riddle,
+                    "type": riddle.type,
+                    "answer": riddle.answer,
+                    "description": riddle.description,
+                    "disturb": riddle.disturb
+                },
+                "joke": {
+                    "subtitle": "每日笑话",
+                    "name": joke.title,
+                    "content": joke.content
+                },
+                "update_time": current_time
+            }
+
+            _LOGGER.info("天聚数行谜语笑话更新成功")
+
+        else:
+            self._available = False
+            self._state = "API请求失败"
+            _LOGGER.error("无法获取天聚数行谜语笑话，请检查API密钥是否正确")
+
+
+class TianMorningEveningSensor(TianBaseSensor):
     """天聚数行早安晚安传感器."""
 
-    def __init__(self, api_key: str, device_info: DeviceInfo, entry_id: str):
+    _endpoints = ("morning", "evening")
+
+    def __init__(self, coordinator: TianDataUpdateCoordinator, device_info: DeviceInfo, entry_id: str):
         """Initialize the sensor."""
-        self._api_key = api_key
+        super().__init__(coordinator, device_info)
         self._attr_name = "早安晚安"
         self._attr_unique_id = f"{entry_id}_morning_evening"
-        self._attr_device_info = device_info
         self._attr_icon = "mdi:weather-sunset"
-        self._state = "等待更新"
-        self._attributes = {}
-        self._available = True
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
+    def _update_from_data(self, data):
+        """根据各端点数据更新状态和属性."""
+        # 获取早安数据
+        morning = data.get("morning")
+        # 获取晚安数据
+        evening = data.get("evening")
+
+        if morning and evening:
+            # 处理数据
+            morning_content = morning.content
+            evening_content = evening.content
+
+            # 优化早安内容处理逻辑
+            if not morning_content or morning_content == "":
+                morning_content = "早安！新的一天开始了！"
+            elif "早安" not in morning_content:
+                morning_content = f"早安！{morning_content}"
+
+            # 优化晚安内容处理逻辑
+            if not evening_content or evening_content == "":
+                evening_content = "晚安！好梦！"
+            elif "晚安" not in evening_content:
+                evening_content = f"{evening_content}晚安！"
+
+            # 设置状态为更新时间
+            current_time = self._get_current_time()
+            self._state = current_time
+            self._available = True
 
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return self._attributes
+            # 设置属性
+            self._attributes = {
+                "title": "早安晚安",
+                "code": 200,
+                "mtitle": "早安心语",
+                "morning": morning_content,
+                "etitle": "晚安心语",
+                "evening": evening_content,
+                "update_time": current_time
+            }
 
-    @property
-    def available(self):
-        """Return True if entity is available."""
-        return self._available
+            _LOGGER.info("天聚数行早安晚安更新成功")
 
-    async def async_update(self):
-        """Update sensor data."""
-        try:
-            # 获取早安数据
-            morning_data = await self._fetch_cached_data("morning", self._fetch_morning_data)
-            # 获取晚安数据
-            evening_data = await self._fetch_cached_data("evening", self._fetch_evening_data)
-            
-            if morning_data and evening_data:
-                # 处理数据
-                morning_content = morning_data.get("result", {}).get("content", "")
-                evening_content = evening_data.get("result", {}).get("content", "")
-                
-                # 优化早安内容处理逻辑
-                if not morning_content or morning_content == "":
-                    morning_content = "早安！新的一天开始了！"
-                elif "早安" not in morning_content:
-                    morning_content = f"早安！{morning_content}"
-                
-                # 优化晚安内容处理逻辑
-                if not evening_content or evening_content == "":
-                    evening_content = "晚安！好梦！"
-                elif "晚安" not in evening_content:
-                    evening_content = f"{evening_content}晚安！"
-                
-                # 设置状态为更新时间
-                current_time = self._get_current_time()
-                self._state = current_time
-                self._available = True
-                
-                # 设置属性
-                self._attributes = {
-                    "title": "早安晚安",
-                    "code": evening_data.get("code", 0),
-                    "mtitle": "早安心语",
-                    "morning": morning_content,
-                    "etitle": "晚安心语",
-                    "evening": evening_content,
-                    "update_time": current_time
-                }
-                
-                _LOGGER.info("天聚数行早安晚安更新成功")
-                
-            else:
-                self._available = False
-                self._state = "API请求失败"
-                _LOGGER.error("无法获取天聚数行早安晚安，请检查API密钥是否正确")
-                
-        except Exception as e:
-            _LOGGER.error("更新天聚数行早安晚安传感器时出错: %s", e)
+        else:
             self._available = False
-            self._state = f"更新失败: {str(e)}"
-
-    async def _fetch_morning_data(self):
-        """获取早安数据."""
-        url = f"{MORNING_API_URL}?key={self._api_key}"
-        return await self._fetch_api_data(url)
-
-    async def _fetch_evening_data(self):
-        """获取晚安数据."""
-        url = f"{EVENING_API_URL}?key={self._api_key}"
-        return await self._fetch_api_data(url)
-
-    async def _fetch_cached_data(self, cache_key, fetch_func):
-        """获取缓存数据，避免重复调用API."""
-        global _data_cache, _cache_timestamp
-        
-        # 检查缓存是否有效（1小时内）
-        current_time = self._get_current_timestamp()
-        if (cache_key in _data_cache and 
-            cache_key in _cache_timestamp and 
-            current_time - _cache_timestamp[cache_key] < 3600):  # 1小时缓存
-            _LOGGER.debug("使用缓存数据: %s", cache_key)
-            return _data_cache[cache_key]
-        
-        # 调用API获取新数据
-        data = await fetch_func()
-        if data and data.get("code") == 200:  # 确保数据有效
-            _data_cache[cache_key] = data
-            _cache_timestamp[cache_key] = current_time
-            _LOGGER.info("已更新缓存数据: %s", cache_key)
-        return data
-
-    async def _fetch_api_data(self, url: str):
-        """获取API数据."""
-        session = async_get_clientsession(self.hass)
-        
-        try:
-            async with async_timeout.timeout(15):
-                response = await session.get(url)
-                if response.status == 200:
-                    data = await response.json()
-                    _LOGGER.debug("API响应: %s", data)
-                    
-                    # 检查API返回的错误码
-                    if data.get("code") == 200:
-                        return data
-                    elif data.get("code") == 130:  # 频率限制
-                        _LOGGER.warning("API调用频率超限，请稍后再试")
-                        return None
-                    elif data.get("code") == 100:  # 常见错误码
-                        _LOGGER.error("API密钥错误: %s", data.get("msg", "未知错误"))
-                    else:
-                        _LOGGER.error("API返回错误[%s]: %s", data.get("code"), data.get("msg", "未知错误"))
-                else:
-                    _LOGGER.error("HTTP请求失败: %s", response.status)
-        except asyncio.TimeoutError:
-            _LOGGER.error("API请求超时")
-        except Exception as e:
-            _LOGGER.error("获取API数据时出错: %s", e)
-        
-        return None
+            self._state = "API请求失败"
+            _LOGGER.error("无法获取天聚数行早安晚安，请检查API密钥是否正确")
 
-    def _get_current_time(self):
-        """获取当前时间字符串."""
-        from datetime import datetime
-        now = datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
-    
-    def _get_current_timestamp(self):
-        """获取当前时间戳."""
-        from datetime import datetime
-        return int(datetime.now().timestamp())
 
-class TianPoetrySensor(SensorEntity):
+class TianPoetrySensor(TianBaseSensor):
     """天聚数行古诗宋词传感器."""
 
-    def __init__(self, api_key: str, device_info: DeviceInfo, entry_id: str):
+    _endpoints = ("poetry", "songci", "yuanqu")
+
+    def __init__(self, coordinator: TianDataUpdateCoordinator, device_info: DeviceInfo, entry_id: str):
         """Initialize the sensor."""
-        self._api_key = api_key
+        super().__init__(coordinator, device_info)
         self._attr_name = "古诗宋词"
         self._attr_unique_id = f"{entry_id}_poetry"
-        self._attr_device_info = device_info
         self._attr_icon = "mdi:book-open-variant"
-        self._state = "等待更新"
-        self._attributes = {}
-        self._available = True
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
+    def _update_from_data(self, data):
+        """根据各端点数据更新状态和属性."""
+        # 获取唐诗数据
+        poetry = data.get("poetry")
+        # 获取宋词数据
+        song_ci = data.get("songci")
+        # 获取元曲数据
+        yuan_qu = data.get("yuanqu")
+
+        if poetry and song_ci and yuan_qu:
+            # 设置状态为更新时间
+            current_time = self._get_current_time()
+            self._state = current_time
+            self._available = True
 
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return self._attributes
+            # 设置属性
+            self._attributes = {
+                "title": "古诗宋词",
+                "code": 200,
+                "tangshi": {
+                    "subtitle": "唐诗鉴赏",
+                    "content": poetry.content,
+                    "source": poetry.title,
+                    "author": poetry.author,
+                    "intro": poetry.intro,
+                    "kind": poetry.kind
+                },
+                "songci": {
+                    "subtitle": "最美宋词",
+                    "content": song_ci.content,
+                    "source": song_ci.source,
+                    "author": song_ci.author
+                },
+                "yuanqu": {
+                    "subtitle": "精选元曲",
+                    "content": yuan_qu.content,
+                    "source": yuan_qu.title,
+                    "author": yuan_qu.author,
+                    "note": yuan_qu.note,
+                    "translation": yuan_qu.translation
+                },
+                "update_time": current_time
+            }
 
-    @property
-    def available(self):
-        """Return True if entity is available."""
-        return self._available
+            _LOGGER.info("天聚数行古诗宋词更新成功")
 
-    async def async_update(self):
-        """Update sensor data."""
-        try:
-            # 获取唐诗数据
-            poetry_data = await self._fetch_cached_data("poetry", self._fetch_poetry_data)
-            # 获取宋词数据
-            song_ci_data = await self._fetch_cached_data("songci", self._fetch_song_ci_data)
-            # 获取元曲数据
-            yuan_qu_data = await self._fetch_cached_data("yuanqu", self._fetch_yuan_qu_data)
-            
-            if poetry_data and song_ci_data and yuan_qu_data:
-                # 处理数据
-                poetry_list = poetry_data.get("result", {}).get("list", [])
-                song_ci_result = song_ci_data.get("result", {})
-                yuan_qu_list = yuan_qu_data.get("result", {}).get("list", [])
-                
-                # 获取第一条数据
-                poetry_first = poetry_list[0] if poetry_list else {}
-                yuan_qu_first = yuan_qu_list[0] if yuan_qu_list else {}
-                
-                # 设置状态为更新时间
-                current_time = self._get_current_time()
-                self._state = current_time
-                self._available = True
-                
-                # 设置属性
-                self._attributes = {
-                    "title": "古诗宋词",
-                    "code": song_ci_data.get("code", 0),
-                    "tangshi": {
-                        "subtitle": "唐诗鉴赏",
-                        "content": poetry_first.get("content", ""),
-                        "source": poetry_first.get("title", ""),
-                        "author": poetry_first.get("author", ""),
-                        "intro": poetry_first.get("intro", ""),
-                        "kind": poetry_first.get("kind", "")
-                    },
-                    "songci": {
-                        "subtitle": "最美宋词",
-                        "content": song_ci_result.get("content", ""),
-                        "source": song_ci_result.get("source", ""),
-                        "author": song_ci_result.get("author", "")
-                    },
-                    "yuanqu": {
-                        "subtitle": "精选元曲",
-                        "content": yuan_qu_first.get("content", ""),
-                        "source": yuan_qu_first.get("title", ""),
-                        "author": yuan_qu_first.get("author", ""),
-                        "note": yuan_qu_first.get("note", ""),
-                        "translation": yuan_qu_first.get("translation", "")
-                    },
-                    "update_time": current_time
-                }
-                
-                _LOGGER.info("天聚数行古诗宋词更新成功")
-                
-            else:
-                self._available = False
-                self._state = "API请求失败"
-                _LOGGER.error("无法获取天聚数行古诗宋词，请检查API密钥是否正确")
-                
-        except Exception as e:
-            _LOGGER.error("更新天聚数行古诗宋词传感器时出错: %s", e)
+        else:
             self._available = False
-            self._state = f"更新失败: {str(e)}"
-
-    async def _fetch_poetry_data(self):
-        """获取唐诗数据."""
-        url = f"{POETRY_API_URL}?key={self._api_key}"
-        return await self._fetch_api_data(url)
-
-    async def _fetch_song_ci_data(self):
-        """获取宋词数据."""
-        url = f"{SONG_CI_API_URL}?key={self._api_key}"
-        return await self._fetch_api_data(url)
-
-    async def _fetch_yuan_qu_data(self):
-        """获取元曲数据."""
-        url = f"{YUAN_QU_API_URL}?key={self._api_key}&num=1&page=1"
-        return await self._fetch_api_data(url)
-
-    async def _fetch_cached_data(self, cache_key, fetch_func):
-        """获取缓存数据，避免重复调用API."""
-        global _data_cache, _cache_timestamp
-        
-        # 检查缓存是否有效（1小时内）
-        current_time = self._get_current_timestamp()
-        if (cache_key in _data_cache and 
-            cache_key in _cache_timestamp and 
-            current_time - _cache_timestamp[cache_key] < 3600):  # 1小时缓存
-            _LOGGER.debug("使用缓存数据: %s", cache_key)
-            return _data_cache[cache_key]
-        
-        # 调用API获取新数据
-        data = await fetch_func()
-        if data and data.get("code") == 200:  # 确保数据有效
-            _data_cache[cache_key] = data
-            _cache_timestamp[cache_key] = current_time
-            _LOGGER.info("已更新缓存数据: %s", cache_key)
-        return data
-
-    async def _fetch_api_data(self, url: str):
-        """获取API数据."""
-        session = async_get_clientsession(self.hass)
-        
-        try:
-            async with async_timeout.timeout(15):
-                response = await session.get(url)
-                if response.status == 200:
-                    data = await response.json()
-                    _LOGGER.debug("API响应: %s", data)
-                    
-                    # 检查API返回的错误码
-                    if data.get("code") == 200:
-                        return data
-                    elif data.get("code") == 130:  # 频率限制
-                        _LOGGER.warning("API调用频率超限，请稍后再试")
-                        return None
-                    elif data.get("code") == 100:  # 常见错误码
-                        _LOGGER.error("API密钥错误: %s", data.get("msg", "未知错误"))
-                    else:
-                        _LOGGER.error("API返回错误[%s]: %s", data.get("code"), data.get("msg", "未知错误"))
-                else:
-                    _LOGGER.error("HTTP请求失败: %s", response.status)
-        except asyncio.TimeoutError:
-            _LOGGER.error("API请求超时")
-        except Exception as e:
-            _LOGGER.error("获取API数据时出错: %s", e)
-        
-        return None
+            self._state = "API请求失败"
+            _LOGGER.error("无法获取天聚数行古诗宋词，请检查API密钥是否正确")
 
-    def _get_current_time(self):
-        """获取当前时间字符串."""
-        from datetime import datetime
-        now = datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
-    
-    def _get_current_timestamp(self):
-        """获取当前时间戳."""
-        from datetime import datetime
-        return int(datetime.now().timestamp())
 
-class TianDailyWordsSensor(SensorEntity):
+class TianDailyWordsSensor(TianBaseSensor):
     """天聚数行每日一言传感器."""
 
-    def __init__(self, api_key: str, device_info: DeviceInfo, entry_id: str):
+    _endpoints = ("history", "sentence", "couplet", "maxim")
+
+    def __init__(self, coordinator: TianDataUpdateCoordinator, device_info: DeviceInfo, entry_id: str):
         """Initialize the sensor."""
-        self._api_key = api_key
+        super().__init__(coordinator, device_info)
         self._attr_name = "每日一言"
         self._attr_unique_id = f"{entry_id}_daily_words"
-        self._attr_device_info = device_info
         self._attr_icon = "mdi:comment-quote"
-        self._state = "等待更新"
-        self._attributes = {}
-        self._available = True
+
+    def _update_from_data(self, data):
+        """根据各端点数据更新状态和属性."""
+        # 获取历史数据
+        history = data.get("history")
+        # 获取名句数据
+        sentence = data.get("sentence")
+        # 获取对联数据
+        couplet = data.get("couplet")
+        # 获取格言数据
+        maxim = data.get("maxim")
+
+        if history and sentence and couplet and maxim:
+            # 设置状态为更新时间
+            current_time = self._get_current_time()
+            self._state = current_time
+            self._available = True
+
+            # 设置属性
+            self._attributes = {
+                "title": "每日一言",
+                "history": {
+                    "subtitle": "简说历史",
+                    "content": history.content or "暂无历史内容"
+                },
+                "sentence": {
+                    "subtitle": "古籍名句",
+                    "content": sentence.content or "暂无名句内容",
+                    "source": sentence.source or "未知来源"
+                },
+                "couplet": {
+                    "subtitle": "经典对联",
+                    "content": couplet.content or "暂无对联内容"
+                },
+                "maxim": {
+                    "subtitle": "英文格言",
+                    "content": maxim.en or "No maxim available",
+                    "translate": maxim.zh or "暂无格言"
+                },
+                "update_time": current_time
+            }
+
+            _LOGGER.info("天聚数行每日一言更新成功")
+
+        else:
+            self._available = False
+            self._state = "API请求失败"
+            _LOGGER.error("无法获取天聚数行每日一言，请检查API密钥是否正确")
+
+
+class TianQuotaSensor(TianBaseSensor):
+    """天聚数行调用额度诊断传感器."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator: TianDataUpdateCoordinator, device_info: DeviceInfo, entry_id: str):
+        """Initialize the sensor."""
+        super().__init__(coordinator, device_info)
+        self._attr_name = "调用额度"
+        self._attr_unique_id = f"{entry_id}_quota"
+        self._attr_icon = "mdi:counter"
+        self._attr_native_unit_of_measurement = "次"
 
     @property
     def state(self):
         """Return the state of the sensor."""
-        return self._state
+        return self.coordinator.budget.remaining
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        return self._attributes
+        return self.coordinator.budget.as_dict()
 
-    @property
-    def available(self):
-        """Return True if entity is available."""
-        return self._available
+    def _update_from_data(self, data):
+        """额度统计直接读取配额管理器，无需处理端点数据."""
 
-    async def async_update(self):
-        """Update sensor data."""
-        try:
-            # 获取历史数据
-            history_data = await self._fetch_cached_data("history", self._fetch_history_data)
-            # 获取名句数据
-            sentence_data = await self._fetch_cached_data("sentence", self._fetch_sentence_data)
-            # 获取对联数据
-            couplet_data = await self._fetch_cached_data("couplet", self._fetch_couplet_data)
-            # 获取格言数据
-            maxim_data = await self._fetch_cached_data("maxim", self._fetch_maxim_data)
-            
-            if history_data and sentence_data and couplet_data and maxim_data:
-                # 处理数据 - 修复列表和字典的混合结构
-                history_result = self._extract_result(history_data)
-                sentence_result = self._extract_result(sentence_data)
-                couplet_result = self._extract_result(couplet_data)
-                maxim_result = self._extract_result(maxim_data)
-                
-                # 设置状态为更新时间
-                current_time = self._get_current_time()
-                self._state = current_time
-                self._available = True
-                
-                # 设置属性
-                self._attributes = {
-                    "title": "每日一言",
-                    "history": {
-                        "subtitle": "简说历史",
-                        "content": history_result.get("content", "暂无历史内容")
-                    },
-                    "sentence": {
-                        "subtitle": "古籍名句",
-                        "content": sentence_result.get("content", "暂无名句内容"),
-                        "source": sentence_result.get("source", "未知来源")
-                    },
-                    "couplet": {
-                        "subtitle": "经典对联",
-                        "content": couplet_result.get("content", "暂无对联内容")
-                    },
-                    "maxim": {
-                        "subtitle": "英文格言",
-                        "content": maxim_result.get("en", "No maxim available"),
-                        "translate": maxim_result.get("zh", "暂无格言")
-                    },
-                    "update_time": current_time
-                }
-                
-                _LOGGER.info("天聚数行每日一言更新成功")
-                
-            else:
-                self._available = False
-                self._state = "API请求失败"
-                _LOGGER.error("无法获取天聚数行每日一言，请检查API密钥是否正确")
-                
-        except Exception as e:
-            _LOGGER.error("更新天聚数行每日一言传感器时出错: %s", e)
-            self._available = False
-            self._state = f"更新失败: {str(e)}"
 
-    def _extract_result(self, data):
-        """从API响应数据中提取result字段，处理可能的列表结构."""
-        if not data:
-            _LOGGER.warning("传入的数据为空")
-            return {}
-            
-        result = data.get("result", {})
-        
-        # 如果result是列表
-        if isinstance(result, list):
-            if result:
-                _LOGGER.debug("检测到列表结构的result，使用第一个元素")
-                return result[0]
-            else:
-                _LOGGER.warning("result列表为空，返回默认值")
-                return {}
-        
-        # 如果result是字典，直接返回
-        elif isinstance(result, dict):
-            return result
-        
-        # 其他情况返回空字典
-        else:
-            _LOGGER.warning("未知的result类型: %s，返回默认值", type(result))
-            return {}
-
-    async def _fetch_history_data(self):
-        """获取历史数据."""
-        url = f"{HISTORY_API_URL}?key={self._api_key}"
-        return await self._fetch_api_data(url)
-
-    async def _fetch_sentence_data(self):
-        """获取名句数据."""
-        url = f"{SENTENCE_API_URL}?key={self._api_key}"
-        return await self._fetch_api_data(url)
-
-    async def _fetch_couplet_data(self):
-        """获取对联数据."""
-        url = f"{COUPLET_API_URL}?key={self._api_key}"
-        return await self._fetch_api_data(url)
-
-    async def _fetch_maxim_data(self):
-        """获取格言数据."""
-        url = f"{MAXIM_API_URL}?key={self._api_key}"
-        return await self._fetch_api_data(url)
-
-    async def _fetch_cached_data(self, cache_key, fetch_func):
-        """获取缓存数据，避免重复调用API."""
-        global _data_cache, _cache_timestamp
-        
-        # 检查缓存是否有效（1小时内）
-        current_time = self._get_current_timestamp()
-        if (cache_key in _data_cache and 
-            cache_key in _cache_timestamp and 
-            current_time - _cache_timestamp[cache_key] < 3600):  # 1小时缓存
-            _LOGGER.debug("使用缓存数据: %s", cache_key)
-            return _data_cache[cache_key]
-        
-        # 调用API获取新数据
-        data = await fetch_func()
-        if data and data.get("code") == 200:  # 确保数据有效
-            _data_cache[cache_key] = data
-            _cache_timestamp[cache_key] = current_time
-            _LOGGER.info("已更新缓存数据: %s", cache_key)
-        return data
-
-    async def _fetch_api_data(self, url: str):
-        """获取API数据."""
-        session = async_get_clientsession(self.hass)
-        
-        try:
-            async with async_timeout.timeout(15):
-                response = await session.get(url)
-                if response.status == 200:
-                    data = await response.json()
-                    _LOGGER.debug("API响应: %s", data)
-                    
-                    # 检查API返回的错误码
-                    if data.get("code") == 200:
-                        # 检查result字段是否为空
-                        result = data.get("result")
-                        if not result or (isinstance(result, list) and len(result) == 0):
-                            _LOGGER.warning("API返回空结果: %s", url)
-                            # 仍然返回数据，但标记为需要处理
-                            return data
-                        return data
-                    elif data.get("code") == 130:  # 频率限制
-                        _LOGGER.warning("API调用频率超限，请稍后再试")
-                        return None
-                    elif data.get("code") == 100:  # 常见错误码
-                        _LOGGER.error("API密钥错误: %s", data.get("msg", "未知错误"))
-                    else:
-                        _LOGGER.error("API返回错误[%s]: %s", data.get("code"), data.get("msg", "未知错误"))
-                else:
-                    _LOGGER.error("HTTP请求失败: %s", response.status)
-        except asyncio.TimeoutError:
-            _LOGGER.error("API请求超时")
-        except Exception as e:
-            _LOGGER.error("获取API数据时出错: %s", e)
-        
-        return None
+class TianContentItemSensor(TianBaseSensor):
+    """单项内容传感器，状态为标题或摘要，正文等大字段不写入历史记录."""
 
-    def _get_current_time(self):
-        """获取当前时间字符串."""
-        from datetime import datetime
-        now = datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
-    
-    def _get_current_timestamp(self):
-        """获取当前时间戳."""
-        from datetime import datetime
-        return int(datetime.now().timestamp())
-        
-class TianScrollingContentSensor(SensorEntity):
+    _unrecorded_attributes = TianBaseSensor._unrecorded_attributes | frozenset(
+        {"content", "intro", "note", "translation", "description", "disturb"}
+    )
+
+    def __init__(self, coordinator: TianDataUpdateCoordinator, device_info: DeviceInfo,
+                 entry_id: str, endpoint: str):
+        """Initialize the sensor."""
+        super().__init__(coordinator, device_info)
+        name, icon, state_field, placeholder = ITEM_SENSORS[endpoint]
+        self._endpoints = (endpoint,)
+        self._state_field = state_field
+        self._placeholder = placeholder
+        self._attr_name = name
+        self._attr_unique_id = f"{entry_id}_item_{endpoint}"
+        self._attr_icon = icon
+
+    def _update_from_data(self, data):
+        """根据端点数据更新状态和属性."""
+        endpoint = self._endpoints[0]
+        record = data.get(endpoint)
+        if not record:
+            self._available = False
+            self._state = "API请求失败"
+            return
+
+        self._available = True
+        self._state = (getattr(record, self._state_field) or self._placeholder)[:STATE_MAX_LENGTH]
+        self._attributes = _fit_attributes(
+            {**record.as_dict(), "update_time": self._get_current_time()},
+            ITEM_ATTRIBUTES_MAX_BYTES,
+        )
+
+
+def _fit_attributes(attributes, max_bytes):
+    """属性超过大小上限时截断最长的文本字段."""
+    size = _attributes_size(attributes)
+    while size > max_bytes:
+        key = max(
+            (key for key, value in attributes.items() if isinstance(value, str) and len(value) > 1),
+            key=lambda key: len(attributes[key].encode("utf-8")),
+            default=None,
+        )
+        if key is None:
+            break
+        encoded = attributes[key].encode("utf-8")
+        keep = max(len(encoded) - (size - max_bytes) - len("…".encode("utf-8")), 0)
+        attributes = {
+            **attributes,
+            key: encoded[:keep].decode("utf-8", "ignore") + "…",
+            "truncated": True,
+        }
+        size = _attributes_size(attributes)
+    return attributes
+
+
+def _attributes_size(attributes):
+    """估算属性序列化后的字节数."""
+    return len(json.dumps(attributes, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class TianScrollingContentSensor(TianBaseSensor):
     """天聚数行滚动内容传感器."""
 
-    def __init__(self, api_key: str, device_info: DeviceInfo, entry_id: str):
+    def __init__(self, coordinator: TianDataUpdateCoordinator, device_info: DeviceInfo, entry_id: str):
         """Initialize the sensor."""
-        self._api_key = api_key
+        super().__init__(coordinator, device_info)
         self._attr_name = "滚动内容"
         self._attr_unique_id = f"{entry_id}_scrolling_content"
-        self._attr_device_info = device_info
         self._attr_icon = "mdi:message-text"
         self._state = self._get_current_time()  # 初始状态设为当前时间
-        self._attributes = {}
-        self._available = True
-        self._current_time_slot = None
-        self._retry_count = 0
-        self._max_retries = 3
-
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return self._attributes
-
-    @property
-    def available(self):
-        """Return True if entity is available."""
-        return self._available
+        # 预先生成的下一时段属性，时段切换时直接替换
+        self._next_attributes = None
+        self._unsub_transition = None
+
+    async def async_added_to_hass(self):
+        """Run when entity about to be added to hass."""
+        await super().async_added_to_hass()
+        self._async_schedule_transition()
+
+    async def async_will_remove_from_hass(self):
+        """Run when entity will be removed from hass."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+
+    @callback
+    def _async_schedule_transition(self):
+        """在下一个时段开始时切换显示内容，时段之间不轮询."""
+        change = self.coordinator.schedule.next_change()
+        self._unsub_transition = async_track_point_in_time(
+            self.hass, self._async_slot_changed, change
+        )
+        if self._next_attributes is None and self._is_cache_ready(self.coordinator.data or {}):
+            self._next_attributes = self._render_attributes(self.coordinator.data, change)
+        _LOGGER.debug("滚动内容将于 %s 切换时段", change.strftime("%H:%M"))
+
+    @callback
+    def _async_slot_changed(self, _now):
+        """时段切换，使用预先生成的属性."""
+        self._unsub_transition = None
+        if self._next_attributes is not None:
+            self._attributes = self._next_attributes
+            self._next_attributes = None
+            self._state = self._attributes["update_time"]
+            freshness = self.coordinator.data_freshness(self._data_endpoints())
+            if freshness:
+                self._attributes.update(freshness)
+            _LOGGER.info("天聚数行滚动内容切换时段: %s", self._attributes["time_slot"])
+        else:
+            self._update_from_coordinator()
+        self._async_write_state()
+        self._async_schedule_transition()
 
-    async def async_update(self):
-        """Update sensor data - 使用缓存数据，避免频繁调用API."""
+    def _update_from_data(self, data):
+        """根据各端点数据更新状态和属性."""
         # 首先更新状态为当前时间
-        current_time = self._get_current_time()
-        self._state = current_time
-        
-        try:
-            # 检查缓存数据是否可用
-            if not self._is_cache_ready():
-                self._retry_count += 1
-                if self._retry_count <= self._max_retries:
-                    _LOGGER.warning("滚动内容：等待其他传感器数据更新 (重试 %d/%d)", 
-                                   self._retry_count, self._max_retries)
-                    # 状态已经是当前时间，不需要修改
-                    return
-                else:
-                    _LOGGER.error("滚动内容：无法获取数据，已达到最大重试次数")
-                    self._available = False
-                    # 状态仍然是当前时间，但实体变为不可用
-                    return
-
-            # 重置重试计数
-            self._retry_count = 0
-            
-            # 从缓存获取数据
-            morning_data = _data_cache.get("morning", {})
-            evening_data = _data_cache.get("evening", {})
-            maxim_data = _data_cache.get("maxim", {})
-            joke_data = _data_cache.get("joke", {})
-            sentence_data = _data_cache.get("sentence", {})
-            couplet_data = _data_cache.get("couplet", {})
-            history_data = _data_cache.get("history", {})
-            poetry_data = _data_cache.get("poetry", {})
-            song_ci_data = _data_cache.get("songci", {})
-            yuan_qu_data = _data_cache.get("yuanqu", {})
-            riddle_data = _data_cache.get("riddle", {})
-
-            # 提取各数据内容
-            morning_content = morning_data.get("result", {}).get("content", "早安！新的一天开始了！")
-            evening_content = evening_data.get("result", {}).get("content", "晚安！好梦！")
-            maxim_result = maxim_data.get("result", {})
-            joke_list = joke_data.get("result", {}).get("list", [{}])
-            sentence_result = sentence_data.get("result", {})
-            couplet_result = couplet_data.get("result", {})
-            history_result = history_data.get("result", {})
-            poetry_list = poetry_data.get("result", {}).get("list", [{}])
-            song_ci_result = song_ci_data.get("result", {})
-            yuan_qu_list = yuan_qu_data.get("result", {}).get("list", [{}])
-            riddle_result = riddle_data.get("result", {})
-
-            # 获取第一条数据
-            joke_first = joke_list[0] if joke_list else {}
-            poetry_first = poetry_list[0] if poetry_list else {}
-            yuan_qu_first = yuan_qu_list[0] if yuan_qu_list else {}
-
-            # 根据当前时间段确定显示内容
-            scrolling_content = self._get_scrolling_content(
-                morning_content,
-                evening_content,
-                maxim_result,
-                joke_first,
-                sentence_result,
-                couplet_result,
-                history_result,
-                poetry_first,
-                song_ci_result,
-                yuan_qu_first,
-                riddle_result
-            )
-            
-            # 设置属性
-            self._available = True
-            
-            self._attributes = {
-                "title": scrolling_content["title"],
-                "subtitle": scrolling_content["subtitle"],
-                "content1": scrolling_content["content1"],
-                "content2": scrolling_content["content2"],
-                "voicetitle": scrolling_content["voicetitle"],
-                "align": scrolling_content["align"],
-                "subalign": scrolling_content["subalign"],
-                "time_slot": scrolling_content["time_slot"],
-                "update_time": current_time
-            }
-            
-            _LOGGER.info("天聚数行滚动内容更新成功，当前时段: %s", scrolling_content["time_slot"])
-                
-        except Exception as e:
-            _LOGGER.error("更新天聚数行滚动内容传感器时出错: %s", e)
+        now = dt_util.now()
+        self._state = now.strftime("%Y-%m-%d %H:%M:%S")
+
+        # 检查协调器数据是否完整
+        if not self._is_cache_ready(data):
+            _LOGGER.error("滚动内容：无法获取完整数据")
             self._available = False
-            # 状态仍然是当前时间，不需要修改
+            self._next_attributes = None
+            # 状态仍然是当前时间，但实体变为不可用
+            return
 
-    def _is_cache_ready(self):
+        self._attributes = self._render_attributes(data, now)
+        self._available = True
+        # 数据更新后重新生成下一时段的属性
+        self._next_attributes = self._render_attributes(
+            data, self.coordinator.schedule.next_change(now)
+        )
+
+        _LOGGER.info("天聚数行滚动内容更新成功，当前时段: %s", self._attributes["time_slot"])
+
+    def _render_attributes(self, data, now):
+        """只生成指定时间所在时段的属性."""
+        schedule = self.coordinator.schedule
+        slot = schedule.slot_at(now)
+        record = data.get(slot.endpoint) or empty_record(slot.endpoint)
+
+        scrolling_content = _SLOT_RENDERERS[slot.endpoint](self, record)
+        return {
+            **scrolling_content,
+            "slot_endpoint": slot.endpoint,
+            "slot_start": f"{slot.start // 60:02d}:{slot.start % 60:02d}",
+            "slot_end": f"{slot.end // 60:02d}:{slot.end % 60:02d}",
+            "next_change": schedule.next_change(now).strftime("%Y-%m-%d %H:%M:%S"),
+            "update_time": now.strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    def _data_endpoints(self):
+        """滚动内容只显示当前时段的端点数据."""
+        return (self.coordinator.schedule.slot_at().endpoint,)
+
+    def _is_cache_ready(self, data):
         """检查缓存数据是否就绪."""
-        required_keys = ["morning", "evening", "maxim", "joke", "sentence", 
-                        "couplet", "history", "poetry", "songci", "yuanqu", "riddle"]
-        
-        for key in required_keys:
-            if key not in _data_cache or not _data_cache[key]:
-                return False
-        
-        # 检查是否有有效的结果数据
-        for key in required_keys:
-            data = _data_cache[key]
-            if not data.get("result"):
-                return False
-                
-        return True
-
-    def _format_line_breaks(self, text):
-        """格式化HTML换行（使用<br>）."""
-        if text is None:
-            return ""
-        text_str = str(text)
-        # 在中文标点符号（。？！）后面添加<br>，但不包括文本末尾
-        return text_str.replace("。", "。<br>").replace("？", "？<br>").replace("！", "！<br>").replace("<br><br>", "<br>").rstrip("<br>")
-
-    def _format_plain_breaks(self, text):
-        """格式化纯文本换行（使用\\n）."""
-        if text is None:
-            return ""
-        text_str = str(text)
-        # 在中文标点符号（。？！）后面添加\n，但不包括文本末尾
-        return text_str.replace("。", "。\n").replace("？", "？\n").replace("！", "！\n").replace("\n\n", "\n").rstrip("\n")
-
-    def _get_scrolling_content(self, morning_content, evening_content, maxim_result, 
-                             joke_result, sentence_result, couplet_result, history_result,
-                             poetry_result, song_ci_result, yuan_qu_result, riddle_result):
-        """根据当前时间段获取滚动内容."""
-        from datetime import datetime
-        
-        now = datetime.now()
-        total_minutes = now.hour * 60 + now.minute
-        
-        # 处理早安内容
+        # 时段表用到的已启用端点都有内容时才就绪，记录没有任何内容时视为无效数据
+        return all(
+            data.get(key)
+            for key in self.coordinator.schedule.endpoints
+            if key in self.coordinator.endpoints
+        )
+
+    def _render_morning(self, record):
+        """早安时段."""
+        morning_content = record.content or "早安！新的一天开始了！"
         if "早安" not in morning_content:
             morning_content = f"早安！{morning_content}"
-        
-        # 处理晚安内容
+        return {
+            "title": "🌅早安问候",
+            "subtitle": "",
+            "content1": morning_content,
+            "content2": morning_content,
+            "voicetitle": "",
+            "align": "left",
+            "subalign": "center",
+            "time_slot": "早安时段"
+        }
+
+    def _render_maxim(self, record):
+        """格言时段."""
+        maxim_en = record.en or "No maxim available"
+        maxim_zh = record.zh or "暂无格言"
+        return {
+            "title": "☘️英文格言",
+            "subtitle": "",
+            "content1": f"【英文】{maxim_en}<br>【中文】{maxim_zh}",
+            "content2": f"【英文】{maxim_en}\n【中文】{maxim_zh}",
+            "voicetitle": "每日英文格言————",
+            "align": "left",
+            "subalign": "center",
+            "time_slot": "格言时段"
+        }
+
+    def _render_joke(self, record):
+        """笑话时段."""
+        joke_title = record.title or "今日笑话"
+        joke_content = record.content or "暂无笑话内容"
+        return {
+            "title": "🌻每日笑话",
+            "subtitle": joke_title,
+            "content1": joke_content,
+            "content2": f"{joke_title}\n{joke_content}",
+            "voicetitle": "今日笑语————",
+            "align": "left",
+            "subalign": "center",
+            "time_slot": "笑话时段"
+        }
+
+    def _render_sentence(self, record):
+        """名句时段."""
+        sentence_source = record.source or "古籍"
+        sentence_content = record.content or "暂无名句内容"
+        sentence_content_html, sentence_content_plain = format_breaks(sentence_content)
+        return {
+            "title": "🌻古籍名句",
+            "subtitle": f"《{sentence_source}》",
+            "content1": sentence_content_html,  # content1不含出处信息
+            "content2": f"《{sentence_source}》\n{sentence_content_plain}",  # content2包含出处信息
+            "voicetitle": "今日古籍名句————",
+            "align": "center",
+            "subalign": "center",
+            "time_slot": "名句时段"
+        }
+
+    def _render_couplet(self, record):
+        """对联时段."""
+        couplet_content = record.content or "暂无对联内容"
+        return {
+            "title": "🔖经典对联",
+            "subtitle": "",
+            "content1": couplet_content,
+            "content2": couplet_content,
+            "voicetitle": "今日经典对联————",
+            "align": "center",
+            "subalign": "center",
+            "time_slot": "对联时段"
+        }
+
+    def _render_history(self, record):
+        """历史时段."""
+        history_content = record.content or "暂无历史内容"
+        return {
+            "title": "🏷️简说历史",
+            "subtitle": "",
+            "content1": history_content,
+            "content2": history_content,
+            "voicetitle": "今日简说历史————",
+            "align": "left",
+            "subalign": "center",
+            "time_slot": "历史时段"
+        }
+
+    def _render_poetry(self, record):
+        """唐诗时段."""
+        poetry_author = record.author or "未知作者"
+        poetry_title = record.title or "无题"
+        poetry_content = record.content or "暂无唐诗内容"
+        poetry_content_html, poetry_content_plain = format_breaks(poetry_content)
+        return {
+            "title": "🔖唐诗鉴赏",
+            "subtitle": f"{poetry_author} · 《{poetry_title}》",
+            "content1": poetry_content_html,  # content1不含作者和标题信息
+            "content2": f"{poetry_author} · 《{poetry_title}》\n{poetry_content_plain}",  # content2包含作者和标题信息
+            "voicetitle": "每日唐诗鉴赏————",
+            "align": "center",
+            "subalign": "center",
+            "time_slot": "唐诗时段"
+        }
+
+    def _render_songci(self, record):
+        """宋词时段."""
+        song_ci_source = record.source or "宋词"
+        song_ci_content = record.content or "暂无宋词内容"
+        song_ci_content_html, song_ci_content_plain = format_breaks(song_ci_content)
+        return {
+            "title": "🌼最美宋词",
+            "subtitle": song_ci_source,
+            "content1": song_ci_content_html,  # content1不含出处信息
+            "content2": f"{song_ci_source}\n{song_ci_content_plain}",  # content2包含出处信息
+            "voicetitle": "今日最美宋词————",
+            "align": "center",
+            "subalign": "center",
+            "time_slot": "宋词时段"
+        }
+
+    def _render_yuanqu(self, record):
+        """元曲时段."""
+        yuan_qu_author = record.author or "未知作者"
+        yuan_qu_title = record.title or "无题"
+        yuan_qu_content = record.content or "暂无元曲内容"
+        yuan_qu_content_html, yuan_qu_content_plain = format_breaks(yuan_qu_content)
+        return {
+            "title": "🔖精选元曲",
+            "subtitle": f"{yuan_qu_author} · 《{yuan_qu_title}》",
+            "content1": yuan_qu_content_html,  # content1不含作者和标题信息
+            "content2": f"{yuan_qu_author} · 《{yuan_qu_title}》\n{yuan_qu_content_plain}",  # content2包含作者和标题信息
+            "voicetitle": "今日精选元曲————",
+            "align": "center",
+            "subalign": "center",
+            "time_slot": "元曲时段"
+        }
+
+    def _render_riddle(self, record):
+        """谜语时段."""
+        riddle_content = record.riddle or "暂无谜语"
+        riddle_type = record.type or "未知类型"
+        riddle_answer = record.answer or "暂无答案"
+        riddle_description = record.description or "暂无解释"
+        riddle_disturb = record.disturb or "暂无相似谜语"
+        return {
+            "title": "🏷️每日谜语",
+            "subtitle": "",
+            "content1": f"【谜面】<br>{riddle_content}（{riddle_type}）<br>【谜底】<br>{riddle_answer}<br>【解释】<br>{riddle_description}<br>【相似】<br>{riddle_disturb}",
+            "content2": f"【谜面】\n{riddle_content}（{riddle_type}）\n【谜底】\n{riddle_answer}",
+            "voicetitle": "今日谜语————",
+            "align": "left",
+            "subalign": "center",
+            "time_slot": "谜语时段"
+        }
+
+    def _render_evening(self, record):
+        """晚安时段."""
+        evening_content = record.content or "晚安！好梦！"
         if "晚安" not in evening_content:
             evening_content = f"{evening_content}晚安！"
-        
-        # 处理笑话数据
-        joke_title = joke_result.get("title", "今日笑话")
-        joke_content = joke_result.get("content", "暂无笑话内容")
-        
-        # 处理名句数据
-        sentence_source = sentence_result.get("source", "古籍")
-        sentence_content = sentence_result.get("content", "暂无名句内容")
-        # 对名句内容进行换行处理
-        sentence_content_formatted = self._format_line_breaks(sentence_content)
-        sentence_content_plain = self._format_plain_breaks(sentence_content)
-        
-        # 处理对联数据
-        couplet_content = couplet_result.get("content", "暂无对联内容")
-        
-        # 处理历史数据
-        history_content = history_result.get("content", "暂无历史内容")
-        
-        # 处理唐诗数据
-        poetry_author = poetry_result.get("author", "未知作者")
-        poetry_title = poetry_result.get("title", "无题")
-        poetry_content = poetry_result.get("content", "暂无唐诗内容")
-        # 对唐诗内容进行换行处理
-        poetry_content_formatted = self._format_line_breaks(poetry_content)
-        poetry_content_plain = self._format_plain_breaks(poetry_content)
-        
-        # 处理宋词数据
-        song_ci_source = song_ci_result.get("source", "宋词")
-        song_ci_content = song_ci_result.get("content", "暂无宋词内容")
-        # 对宋词内容进行换行处理
-        song_ci_content_formatted = self._format_line_breaks(song_ci_content)
-        song_ci_content_plain = self._format_plain_breaks(song_ci_content)
-        
-        # 处理元曲数据
-        yuan_qu_author = yuan_qu_result.get("author", "未知作者")
-        yuan_qu_title = yuan_qu_result.get("title", "无题")
-        yuan_qu_content = yuan_qu_result.get("content", "暂无元曲内容")
-        # 对元曲内容进行换行处理
-        yuan_qu_content_formatted = self._format_line_breaks(yuan_qu_content)
-        yuan_qu_content_plain = self._format_plain_breaks(yuan_qu_content)
-        
-        # 处理谜语数据
-        riddle_content = riddle_result.get("riddle", "暂无谜语")
-        riddle_type = riddle_result.get("type", "未知类型")
-        riddle_answer = riddle_result.get("answer", "暂无答案")
-        riddle_description = riddle_result.get("description", "暂无解释")
-        riddle_disturb = riddle_result.get("disturb", "暂无相似谜语")
-        
-        # 处理格言数据
-        maxim_en = maxim_result.get("en", "No maxim available")
-        maxim_zh = maxim_result.get("zh", "暂无格言")
-        
-        # 时间段判断
-        if total_minutes >= 5*60+30 and total_minutes < 8*60+30:  # 5:30-8:29
-            return {
-                "title": "🌅早安问候",
-                "subtitle": "",
-                "content1": morning_content,
-                "content2": morning_content,
-                "voicetitle": "",
-                "align": "left",
-                "subalign": "center",
-                "time_slot": "早安时段"
-            }
-        elif total_minutes >= 8*60+30 and total_minutes < 11*60:  # 8:30-10:59
-            return {
-                "title": "☘️英文格言",
-                "subtitle": "",
-                "content1": f"【英文】{maxim_en}<br>【中文】{maxim_zh}",
-                "content2": f"【英文】{maxim_en}\n【中文】{maxim_zh}",
-                "voicetitle": "每日英文格言————",
-                "align": "left",
-                "subalign": "center",
-                "time_slot": "格言时段"
-            }
-        elif total_minutes >= 11*60 and total_minutes < 13*60:  # 11:00-12:59
-            return {
-                "title": "🌻每日笑话",
-                "subtitle": joke_title,
-                "content1": joke_content,
-                "content2": f"{joke_title}\n{joke_content}",
-                "voicetitle": "今日笑语————",
-                "align": "left",
-                "subalign": "center",
-                "time_slot": "笑话时段"
-            }
-        elif total_minutes >= 13*60 and total_minutes < 14*60:  # 13:00-13:59
-            return {
-                "title": "🌻古籍名句",
-                "subtitle": f"《{sentence_source}》",
-                "content1": sentence_content_formatted,  # content1不含出处信息
-                "content2": f"《{sentence_source}》\n{sentence_content_plain}",  # content2包含出处信息
-                "voicetitle": "今日古籍名句————",
-                "align": "center",
-                "subalign": "center",
-                "time_slot": "名句时段"
-            }
-        elif total_minutes >= 14*60 and total_minutes < 15*60:  # 14:00-14:59
-            return {
-                "title": "🔖经典对联",
-                "subtitle": "",
-                "content1": couplet_content,
-                "content2": couplet_content,
-                "voicetitle": "今日经典对联————",
-                "align": "center",
-                "subalign": "center",
-                "time_slot": "对联时段"
-            }
-        elif total_minutes >= 15*60 and total_minutes < 17*60:  # 15:00-16:59
-            return {
-                "title": "🏷️简说历史",
-                "subtitle": "",
-                "content1": history_content,
-                "content2": history_content,
-                "voicetitle": "今日简说历史————",
-                "align": "left",
-                "subalign": "center",
-                "time_slot": "历史时段"
-            }
-        elif total_minutes >= 17*60 and total_minutes < 18*60+30:  # 17:00-18:29
-            return {
-                "title": "🔖唐诗鉴赏",
-                "subtitle": f"{poetry_author} · 《{poetry_title}》",
-                "content1": poetry_content_formatted,  # content1不含作者和标题信息
-                "content2": f"{poetry_author} · 《{poetry_title}》\n{poetry_content_plain}",  # content2包含作者和标题信息
-                "voicetitle": "每日唐诗鉴赏————",
-                "align": "center",
-                "subalign": "center",
-                "time_slot": "唐诗时段"
-            }
-        elif total_minutes >= 18*60+30 and total_minutes < 20*60+30:  # 18:30-20:29
-            return {
-                "title": "🌼最美宋词",
-                "subtitle": song_ci_source,
-                "content1": song_ci_content_formatted,  # content1不含出处信息
-                "content2": f"{song_ci_source}\n{song_ci_content_plain}",  # content2包含出处信息
-                "voicetitle": "今日最美宋词————",
-                "align": "center",
-                "subalign": "center",
-                "time_slot": "宋词时段"
-            }
-        elif total_minutes >= 20*60+30 and total_minutes < 21*60:  # 20:30-20:59
-            return {
-                "title": "🔖精选元曲",
-                "subtitle": f"{yuan_qu_author} · 《{yuan_qu_title}》",
-                "content1": yuan_qu_content_formatted,  # content1不含作者和标题信息
-                "content2": f"{yuan_qu_author} · 《{yuan_qu_title}》\n{yuan_qu_content_plain}",  # content2包含作者和标题信息
-                "voicetitle": "今日精选元曲————",
-                "align": "center",
-                "subalign": "center",
-                "time_slot": "元曲时段"
-            }
-        elif total_minutes >= 21*60 and total_minutes < 22*60:  # 21:00-21:59
-            return {
-                "title": "🏷️每日谜语",
-                "subtitle": "",
-                "content1": f"【谜面】<br>{riddle_content}（{riddle_type}）<br>【谜底】<br>{riddle_answer}<br>【解释】<br>{riddle_description}<br>【相似】<br>{riddle_disturb}",
-                "content2": f"【谜面】\n{riddle_content}（{riddle_type}）\n【谜底】\n{riddle_answer}",
-                "voicetitle": "今日谜语————",
-                "align": "left",
-                "subalign": "center",
-                "time_slot": "谜语时段"
-            }
-        else:  # 22:00-次日5:29
-            return {
-                "title": "🌃晚安问候",
-                "subtitle": "",
-                "content1": evening_content,
-                "content2": evening_content,
-                "voicetitle": "",
-                "align": "left",
-                "subalign": "center",
-                "time_slot": "晚安时段"
-            }
-
-    def _get_current_time(self):
-        """获取当前时间字符串."""
-        from datetime import datetime
-        now = datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
+        return {
+            "title": "🌃晚安问候",
+            "subtitle": "",
+            "content1": evening_content,
+            "content2": evening_content,
+            "voicetitle": "",
+            "align": "left",
+            "subalign": "center",
+            "time_slot": "晚安时段"
+        }
+
+
+# 各端点时段的渲染方法，只渲染当前时段
+_SLOT_RENDERERS = {
+    "morning": TianScrollingContentSensor._render_morning,
+    "maxim": TianScrollingContentSensor._render_maxim,
+    "joke": TianScrollingContentSensor._render_joke,
+    "sentence": TianScrollingContentSensor._render_sentence,
+    "couplet": TianScrollingContentSensor._render_couplet,
+    "history": TianScrollingContentSensor._render_history,
+    "poetry": TianScrollingContentSensor._render_poetry,
+    "songci": TianScrollingContentSensor._render_songci,
+    "yuanqu": TianScrollingContentSensor._render_yuanqu,
+    "riddle": TianScrollingContentSensor._render_riddle,
+    "evening": TianScrollingContentSensor._render_evening,
+}
@@ -0,0 +1,146 @@
+"""Services for Tian API integration."""
+import asyncio
+import logging
+import time
+
+import voluptuous as vol
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    DOMAIN,
+    SEARCH_DEFAULT_LIMIT,
+    SEARCH_MAX_LIMIT,
+    SERVICE_SEARCH,
+    SERVICE_REFRESH,
+    REFRESH_DISABLED,
+)
+from .endpoints import ENDPOINTS, SEARCH_ENDPOINTS
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_QUERY = "query"
+ATTR_ENDPOINT = "endpoint"
+ATTR_LIMIT = "limit"
+ATTR_FORCE = "force"
+
+SEARCH_SCHEMA = vol.Schema({
+    vol.Required(ATTR_QUERY): cv.string,
+    vol.Optional(ATTR_ENDPOINT): vol.All(cv.ensure_list, [vol.In(SEARCH_ENDPOINTS)]),
+    vol.Optional(ATTR_LIMIT, default=SEARCH_DEFAULT_LIMIT): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=SEARCH_MAX_LIMIT)
+    ),
+})
+
+REFRESH_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Optional(ATTR_ENDPOINT): vol.All(cv.ensure_list, [vol.In(list(ENDPOINTS))]),
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    }),
+    cv.has_at_least_one_key(ATTR_ENDPOINT, ATTR_ENTITY_ID),
+)
+
+
+def async_setup_services(hass: HomeAssistant):
+    """注册集成服务，多个配置条目共用."""
+    if hass.services.has_service(DOMAIN, SERVICE_SEARCH):
+        return
+
+    async def async_search(call: ServiceCall):
+        """在本地已获取的内容中检索."""
+        start = time.perf_counter()
+        limit = call.data[ATTR_LIMIT]
+        results = {}
+        for coordinator in hass.data[DOMAIN].values():
+            for score, endpoint, item in coordinator.search_index.search(
+                call.data[ATTR_QUERY], call.data.get(ATTR_ENDPOINT), limit
+            ):
+                # 多个配置条目获取到相同内容时只保留一条
+                key = (endpoint, item.get("content"))
+                if key not in results or results[key]["score"] < score:
+                    results[key] = {"endpoint": endpoint, "score": round(score, 4), **item}
+
+        ranked = sorted(results.values(), key=lambda result: result["score"], reverse=True)
+        took = (time.perf_counter() - start) * 1000
+        _LOGGER.debug("检索 %s 得到 %d 条结果，耗时 %.1f 毫秒", call.data[ATTR_QUERY], len(ranked), took)
+        return {"results": ranked[:limit], "took_ms": round(took, 1)}
+
+    async def async_refresh(call: ServiceCall):
+        """刷新指定端点或实体使用的端点."""
+        start = time.perf_counter()
+        coordinators = list(hass.data[DOMAIN].values())
+        entity_ids = call.data.get(ATTR_ENTITY_ID, [])
+        unknown = [
+            entity_id for entity_id in entity_ids
+            if not any(entity_id in coordinator.entities for coordinator in coordinators)
+        ]
+        if unknown:
+            raise HomeAssistantError(f"不是天聚数行实体: {', '.join(unknown)}")
+
+        results = await asyncio.gather(*(
+            _async_refresh_coordinator(
+                coordinator, call.data.get(ATTR_ENDPOINT, []), entity_ids, call.data[ATTR_FORCE]
+            )
+            for coordinator in coordinators
+        ))
+        took = (time.perf_counter() - start) * 1000
+        _LOGGER.debug("刷新服务完成，耗时 %.1f 毫秒", took)
+        return {
+            "results": [result for entry_results in results for result in entry_results],
+            "took_ms": round(took, 1),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH,
+        async_search,
+        schema=SEARCH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        async_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def _async_refresh_coordinator(coordinator, endpoints, entity_ids, force):
+    """刷新一个配置条目中请求的端点，返回各端点的结果代码和耗时."""
+    requested = set(endpoints)
+    for entity_id in entity_ids:
+        entity = coordinator.entities.get(entity_id)
+        if entity is not None:
+            requested.update(entity.content_endpoints)
+    if not requested:
+        return []
+
+    async def _async_refresh(endpoint):
+        start = time.perf_counter()
+        if endpoint in coordinator.endpoints:
+            result = await coordinator.async_refresh_endpoint(endpoint, force)
+        else:
+            result = REFRESH_DISABLED
+        return {
+            "entry_id": coordinator.entry.entry_id,
+            "endpoint": endpoint,
+            "result": result,
+            "took_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+    # 按优先级顺序发起请求，额度不足时优先保证重要端点
+    ordered = sorted(requested, key=lambda endpoint: ENDPOINTS[endpoint].priority)
+    return await asyncio.gather(*(_async_refresh(endpoint) for endpoint in ordered))
+
+
+def async_unload_services(hass: HomeAssistant):
+    """最后一个配置条目卸载后移除服务."""
+    if hass.data.get(DOMAIN):
+        return
+
+    hass.services.async_remove(DOMAIN, SERVICE_SEARCH)
+    hass.services.async_remove(DOMAIN, SERVICE_REFRESH)